@@ -1,11 +1,66 @@
-import arcade
+import time
 
-from src.utils.constants import GameConfig
-from src.window import Menu, Window, WinLoseMenu
+# taken before anything else is imported, so the startup report includes every import
+START = time.perf_counter()
+
+import argparse  # noqa: E402
+import pathlib  # noqa: E402
+
+from src.utils.constants import GameConfig  # noqa: E402
 
 if __name__ == "__main__":
-    game = Window(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT, GameConfig.SCREEN_TITLE)
-    menu = Menu(game)
-    win_lose = WinLoseMenu(game)
-    game.show_view(menu)
-    arcade.run()
+    parser = argparse.ArgumentParser(description=GameConfig.SCREEN_TITLE)
+    parser.add_argument("--headless", action="store_true", help="run the simulation without a window")
+    parser.add_argument("--ticks", type=int, default=600, help="ticks to simulate in headless mode")
+    parser.add_argument("--seed", type=int, default=GameConfig.MAP_SEED, help="seed of the generated map")
+    parser.add_argument("--record", type=pathlib.Path, help="write the input of the session to this file")
+    parser.add_argument("--replay", type=pathlib.Path, help="replay a recorded session, headless unless --render")
+    parser.add_argument("--render", action="store_true", help="render a replay, profiling every frame")
+    parser.add_argument("--profile-startup", action="store_true", help="report import and first frame times, then quit")
+    args = parser.parse_args()
+
+    recording = None
+    if args.replay:
+        from src.world import InputRecording
+
+        recording = InputRecording.load(args.replay)
+        # an unseeded map can't be rebuilt, replaying on another map would silently diverge
+        if recording.seed is None:
+            parser.error(f"{args.replay} was recorded on a map that wasn't generated from a seed")
+
+    if recording is not None and not args.render:
+        from src.world import HeadlessRunner, Simulation
+
+        simulation = Simulation(recording.generate_map())
+        stats = HeadlessRunner(simulation, script=recording.to_script()).run(recording.ticks)
+        print(stats.to_dict())
+    elif args.headless:
+        from src.world import HeadlessRunner, Simulation, generate_map
+
+        stats = HeadlessRunner(Simulation(generate_map(args.seed))).run(args.ticks)
+        print(stats.to_dict())
+    else:
+        from src.utils.profiler import StartupTimer
+
+        startup = StartupTimer(START)
+        import arcade
+
+        from src.window import Game, LoadingView, Menu, Window
+
+        startup.mark("imports")
+        game = Window(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT, GameConfig.SCREEN_TITLE)
+        startup.mark("window")
+        game.record_path = args.record
+        if args.profile_startup:
+            game.startup = startup
+        if recording is not None:
+            game.replay = recording
+            game.profiler.enabled = True
+            # a replay starts playing right away, the menu is skipped and its preload is started here instead
+            game.assets.preload()
+            game.audio.preload()
+            game.show_view(LoadingView(game, Game(game)))
+        else:
+            game.show_view(Menu(game))
+        startup.mark("menu")
+        arcade.run()
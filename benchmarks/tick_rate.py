@@ -0,0 +1,89 @@
+import argparse
+import json
+import random
+import typing as t
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Tiles
+from src.world.chunks import ChunkedMap, border_layout
+from src.world.headless import HeadlessRunner, InputScript
+from src.world.simulation import Simulation
+
+__all__: tuple[str, ...] = (
+    "build_simulation",
+    "run_benchmark",
+)
+
+MAP_SIZE: t.Final[int] = 256
+# no 0: the camera alone soon stops against a wall, leaving nothing but the loop overhead to time
+ENTITY_COUNTS: t.Final[tuple[int, ...]] = (100, 1_000, 5_000)
+WALL_COUNTS: t.Final[tuple[int, ...]] = (0, 1_000, 10_000)
+SPEED: t.Final[int] = GameConfig.CAMERA_MOVEMENT_SPEED
+
+# camera walks a square so the run covers both axes of the collision code
+CAMERA_SCRIPT: t.Final[InputScript] = {
+    0: (lambda sim: sim.set_camera_velocity(change_x=SPEED),),
+    60: (lambda sim: sim.set_camera_velocity(change_x=0, change_y=SPEED),),
+    120: (lambda sim: sim.set_camera_velocity(change_x=-SPEED, change_y=0),),
+    180: (lambda sim: sim.set_camera_velocity(change_x=0, change_y=-SPEED),),
+    240: (lambda sim: sim.set_camera_velocity(change_y=0),),
+}
+
+
+def build_simulation(entities: int, walls: int, seed: int = 35) -> Simulation:
+    """
+    Builds a simulation on a square map with randomly scattered walls and bouncing entities.
+    :param entities: Number of bouncing entities besides the camera.
+    :param walls: Number of walls scattered inside the border.
+    :param seed: Seed used for the wall and entity placement.
+    """
+    rng = random.Random(seed)
+    inner = [(x, y) for x in range(1, MAP_SIZE - 1) for y in range(1, MAP_SIZE - 1)]
+    center = (MAP_SIZE // 2, MAP_SIZE // 2)
+    wall_tiles = set(rng.sample(inner, walls)) - {center}
+    border = border_layout(MAP_SIZE, MAP_SIZE)
+
+    def layout(x: int, y: int) -> int:
+        return Tiles.WALL if (x, y) in wall_tiles else border(x, y)
+
+    simulation = Simulation(ChunkedMap(MAP_SIZE, MAP_SIZE, layout))
+    free = [tile for tile in inner if tile not in wall_tiles]
+    for x, y in rng.sample(free, entities):
+        cx, cy = simulation.world.tile_center(x, y)
+        simulation.entities.spawn(cx, cy, rng.uniform(-SPEED, SPEED), rng.uniform(-SPEED, SPEED), 16, 16)
+    return simulation
+
+
+def run_benchmark(ticks: int, warmup: int) -> list[dict[str, float]]:
+    results: list[dict[str, float]] = []
+    for walls in WALL_COUNTS:
+        for entities in ENTITY_COUNTS:
+            simulation = build_simulation(entities, walls)
+            runner = HeadlessRunner(simulation, script=CAMERA_SCRIPT)
+            runner.run(warmup)
+            stats = runner.run(ticks)
+            results.append({"entities": entities, "walls": walls, **stats.to_dict()})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures headless simulation throughput.")
+    parser.add_argument("--ticks", type=int, default=600, help="measured ticks per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="unmeasured ticks run before each scenario")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to a JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.ticks, args.warmup)
+    print(f"{'entities':>9} {'walls':>7} {'ticks/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for row in results:
+        print(
+            f"{row['entities']:>9} {row['walls']:>7} {row['ticks_per_second']:>10.1f} "
+            f"{row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f}"
+        )
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 from .constants import GameConfig
-from .enums import Paths, Styles
+from .enums import Inputs, Paths, Styles, Tiles
 from .models import RGB, Style
+from .profiler import FrameProfiler, StartupTimer
 
 __all__: tuple[str, ...] = (
+    "FrameProfiler",
     "GameConfig",
     "Styles",
     "Paths",
+    "Tiles",
+    "Inputs",
     "Style",
     "RGB",
+    "StartupTimer",
 )
@@ -12,8 +12,46 @@ class GameConfig:
     SCREEN_HEIGHT: t.Final[int] = 600
     SCREEN_WIDTH: t.Final[int] = 800
     MUSIC_VOLUME: t.Final[float] = 0.5
+    EFFECTS_VOLUME: t.Final[float] = 0.8
+    AUDIO_VOICES: t.Final[int] = 16
+    AUDIO_CACHE_BYTES: t.Final[int] = 16 * 1024 * 1024
+    AUDIO_REPEAT_INTERVAL: t.Final[float] = 0.03
     MAP_SIZE_X: t.Final[int] = 10
     MAP_SIZE_Y: t.Final[int] = 10
+    TILE_SIZE: t.Final[int] = 32
+    CHUNK_SIZE: t.Final[int] = 16
+    CHUNK_LOAD_MARGIN: t.Final[int] = 1
+    MAP_SEED: t.Final[int] = 35
+    GENERATION_WORKERS: t.Final[int] = 4
+    GENERATION_PARALLEL_TILES: t.Final[int] = 2048 * 2048
     CAMERA_MOVEMENT_SPEED: t.Final[int] = 5
+    CAMERA_SMOOTHING: t.Final[float] = 12.0
+    # world pixels per screen pixel along each axis, so 2.0 shows four times the window area
+    CAMERA_ZOOM_LEVELS: t.Final[tuple[float, ...]] = (0.5, 0.75, 1.0, 1.5, 2.0)
+    TICK_RATE: t.Final[int] = 60
+    MAX_CATCH_UP_STEPS: t.Final[int] = 5
     VIEWPORT_ANGLE: t.Final[float] = math.pi / 4
     INVERT_MOUSE: t.Final[bool] = False
+    ATLAS_SIZE: t.Final[int] = 1024
+    MAX_CACHED_BACKGROUNDS: t.Final[int] = 2
+    PRELOAD_WORKERS: t.Final[int] = 2
+    LOADING_FRAME_BUDGET: t.Final[float] = 1 / 120
+    PROFILER_SAMPLES: t.Final[int] = 600
+    PROFILER_OVERLAY_REFRESH: t.Final[float] = 0.25
+    PROFILER_TRACE_FILE: t.Final[str] = "frame_trace.json"
+    STARTUP_TRACE_FILE: t.Final[str] = "startup_trace.json"
+    CONSOLE_SCROLLBACK: t.Final[int] = 256
+    CONSOLE_VISIBLE_LINES: t.Final[int] = 12
+    CONSOLE_LINE_HEIGHT: t.Final[int] = 25
+    AMBIENT_LIGHT: t.Final[tuple[int, int, int]] = (255, 255, 255)
+    LIGHT_BUFFER_SCALE: t.Final[float] = 0.5
+    LIGHT_CELL_SIZE: t.Final[int] = 256
+    PARTICLE_CAPACITY: t.Final[int] = 32768
+    SPATIAL_CELL_SIZE: t.Final[int] = 128
+    PATHFINDING_BUDGET: t.Final[int] = 2048
+    PATH_CACHE_SIZE: t.Final[int] = 1024
+    SIMULATION_WORKERS: t.Final[int] = 2
+    PATH_JOB_SIZE: t.Final[int] = 64
+    PATH_JOB_RETRIES: t.Final[int] = 2
+    AUTOSAVE_INTERVAL: t.Final[float] = 5.0
+    AUTOSAVE_FULL_EVERY: t.Final[int] = 12
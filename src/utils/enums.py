@@ -8,6 +8,8 @@ __all__: tuple[str, ...] = (
     "BaseEnum",
     "Styles",
     "Paths",
+    "Tiles",
+    "Inputs",
 )
 
 
@@ -38,11 +40,21 @@ class Styles(BaseEnum):
         border_color_pressed=RGB(0, 110, 230),
     )
 
-    def __get__(self, instance: t.Any, owner: t.Any) -> t.Any:
-        return {k: v for k, v in self.value.to_dict().items() if v is not None}
-
 
 class Paths(BaseEnum):
     BASE = pathlib.Path(__file__).resolve().parent.parent
     ASSETS = BASE / "assets"  # type: ignore
     SRC = BASE / "src"  # type: ignore
+    CACHE = BASE / ".cache"  # type: ignore
+    SAVES = BASE / "saves"  # type: ignore
+
+
+class Tiles(enum.IntEnum):
+    EMPTY = 0
+    WALL = 1
+
+
+class Inputs(enum.IntEnum):
+    CAMERA_VELOCITY_X = 0
+    CAMERA_VELOCITY_Y = 1
+    CAMERA_MOVE = 2
@@ -0,0 +1,163 @@
+import array
+import csv
+import json
+import pathlib
+import time
+import typing as t
+
+import attrs
+
+from .constants import GameConfig
+
+__all__: tuple[str, ...] = (
+    "FrameProfiler",
+    "PhaseStats",
+    "PhaseTimer",
+    "RingBuffer",
+    "StartupTimer",
+)
+
+
+class RingBuffer:
+    """
+    Fixed size buffer of floats which overwrites its oldest samples.
+    :param capacity: Number of samples kept.
+    """
+
+    __slots__ = ("capacity", "_data", "_index", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data = array.array("d", bytes(8 * capacity))
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def values(self) -> list[float]:
+        """Returns the samples from oldest to newest."""
+        if self._count < self.capacity:
+            return self._data[: self._count].tolist()
+        return (self._data[self._index :] + self._data[: self._index]).tolist()
+
+
+@attrs.define(frozen=True, slots=True)
+class PhaseStats:
+    """Summary of a phase in milliseconds."""
+
+    samples: int
+    min: float
+    avg: float
+    p99: float
+
+
+class PhaseTimer:
+    """
+    Reusable context manager timing one phase, does nothing while the profiler is disabled.
+    :param profiler: Profiler the timer belongs to.
+    :param samples: Buffer the durations are written to.
+    """
+
+    __slots__ = ("profiler", "samples", "_start")
+
+    def __init__(self, profiler: "FrameProfiler", samples: RingBuffer) -> None:
+        self.profiler = profiler
+        self.samples = samples
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        if self.profiler.enabled:
+            self._start = time.perf_counter()
+
+    def __exit__(self, *_: t.Any) -> None:
+        if self._start:
+            self.samples.append(time.perf_counter() - self._start)
+            self._start = 0.0
+
+
+class FrameProfiler:
+    """
+    Times named frame phases into ring buffers.
+    :param capacity: Number of samples kept per phase.
+    :param enabled: Whether phases are timed from the start.
+    """
+
+    def __init__(self, capacity: int = GameConfig.PROFILER_SAMPLES, enabled: bool = False) -> None:
+        self.capacity = capacity
+        self.enabled = enabled
+        self._phases: dict[str, RingBuffer] = {}
+        self._timers: dict[str, PhaseTimer] = {}
+
+    @property
+    def phases(self) -> tuple[str, ...]:
+        return tuple(self._phases)
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+
+    def phase(self, name: str) -> PhaseTimer:
+        """
+        Returns the timer of a phase, use as ``with profiler.phase("draw.scene"): ...``.
+        :param name: Name of the phase.
+        """
+        timer = self._timers.get(name)
+        if timer is None:
+            samples = self._phases[name] = RingBuffer(self.capacity)
+            timer = self._timers[name] = PhaseTimer(self, samples)
+        return timer
+
+    def stats(self, name: str) -> PhaseStats:
+        ordered = sorted(self._phases[name].values())
+        if not ordered:
+            return PhaseStats(0, 0.0, 0.0, 0.0)
+        p99 = ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+        return PhaseStats(len(ordered), ordered[0] * 1000, sum(ordered) / len(ordered) * 1000, p99 * 1000)
+
+    def has_samples(self) -> bool:
+        return any(len(samples) for samples in self._phases.values())
+
+    def export(self, path: t.Union[str, pathlib.Path]) -> None:
+        """
+        Writes the buffered samples in milliseconds, as CSV if the path ends with ``.csv`` and JSON otherwise.
+        :param path: File to write.
+        """
+        path = pathlib.Path(path)
+        trace = {name: [sample * 1000 for sample in samples.values()] for name, samples in self._phases.items()}
+        if path.suffix == ".csv":
+            with path.open("w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(("phase", "sample", "ms"))
+                for name, samples in trace.items():
+                    writer.writerows((name, index, sample) for index, sample in enumerate(samples))
+        else:
+            summary = {name: attrs.asdict(self.stats(name)) for name in trace}
+            with path.open("w") as file:
+                json.dump({"summary": summary, "samples": trace}, file)
+
+
+class StartupTimer:
+    """
+    Records when named steps of the launch finish, in milliseconds since the timer was created.
+    :param start: ``time.perf_counter()`` value the steps are measured from.
+    """
+
+    def __init__(self, start: t.Optional[float] = None) -> None:
+        self.start = time.perf_counter() if start is None else start
+        self.marks: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Records a step, only its first occurrence counts."""
+        self.marks.setdefault(name, (time.perf_counter() - self.start) * 1000)
+
+    def report(self) -> str:
+        return "\n".join(f"{name:<12}{elapsed:>9.1f} ms" for name, elapsed in self.marks.items())
+
+    def export(self, path: t.Union[str, pathlib.Path]) -> None:
+        with pathlib.Path(path).open("w") as file:
+            json.dump(self.marks, file)
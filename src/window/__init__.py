@@ -1,9 +1,24 @@
-from src.window.views import Game, Menu, WinLoseMenu
+import typing as t
+
+from src.window.views import LoadingView, Menu, WinLoseMenu
 from src.window.window import Window
 
+if t.TYPE_CHECKING:
+    from src.window.game import Game
+
 __all__: tuple[str, ...] = (
     "Game",
+    "LoadingView",
     "Menu",
     "Window",
     "WinLoseMenu",
 )
+
+
+def __getattr__(name: str) -> t.Any:
+    # the game view imports the simulation, numpy and the lighting, which the menu doesn't need
+    if name == "Game":
+        from src.window.game import Game
+
+        return Game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,220 @@
+import collections
+import concurrent.futures
+import pathlib
+import time
+import typing as t
+
+import arcade
+import arcade.hitbox
+import PIL.Image
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Paths
+
+__all__: tuple[str, ...] = ("AssetManager",)
+
+
+IMAGE_SUFFIXES: t.Final[frozenset[str]] = frozenset((".png", ".jpg", ".jpeg"))
+BACKGROUND_FOLDER: t.Final[str] = "titles"
+ASSETS: t.Final[pathlib.Path] = t.cast(pathlib.Path, Paths.ASSETS)
+BackgroundSize = tuple[int, int]
+
+
+class AssetManager:
+    """
+    Decodes every file under ``Paths.ASSETS`` once and hands out cached textures.
+    Sprite textures are packed into one shared atlas, backgrounds are kept in a small LRU cache.
+    :param max_backgrounds: Number of decoded backgrounds kept resident.
+    :param workers: Number of threads decoding images for :meth:`preload`.
+    """
+
+    def __init__(
+        self,
+        max_backgrounds: int = GameConfig.MAX_CACHED_BACKGROUNDS,
+        workers: int = GameConfig.PRELOAD_WORKERS,
+    ) -> None:
+        self.max_backgrounds = max_backgrounds
+        self._textures: dict[str, arcade.Texture] = {}
+        self._frames: dict[tuple[str, int, int], tuple[arcade.Texture, ...]] = {}
+        self._backgrounds: collections.OrderedDict[str, arcade.Texture] = collections.OrderedDict()
+        self._atlas: t.Optional[arcade.TextureAtlas] = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self._pending: dict[str, concurrent.futures.Future[arcade.Texture]] = {}
+        self._queued: int = 0
+
+    @staticmethod
+    def path(*parts: str) -> str:
+        return ASSETS.joinpath(*parts).as_posix()
+
+    @property
+    def atlas(self) -> arcade.TextureAtlas:
+        """Atlas shared by every sprite list, created on first use since it needs a GL context."""
+        if self._atlas is None:
+            size = GameConfig.ATLAS_SIZE
+            self._atlas = arcade.TextureAtlas((size, size))
+        return self._atlas
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the preloaded assets which are decoded and uploaded."""
+        if not self._queued:
+            return 1.0
+        return 1 - len(self._pending) / self._queued
+
+    def preload(self) -> None:
+        """Starts decoding every image under ``Paths.ASSETS`` which isn't resident yet on the worker threads."""
+        for path in sorted(ASSETS.rglob("*")):
+            if path.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            parts = path.relative_to(ASSETS).parts
+            key = "/".join(parts)
+            if key in self._textures or key in self._backgrounds or key in self._pending:
+                continue
+            if parts[0] == BACKGROUND_FOLDER:
+                future = self._executor.submit(self._decode_background, parts, self._screen_size())
+            else:
+                future = self._executor.submit(self._decode_sprite, parts)
+            self._pending[key] = future
+            self._queued += 1
+
+    def upload(self, budget: float) -> int:
+        """
+        Uploads decoded textures to the GPU until ``budget`` seconds have passed, call once per frame.
+        Returns the number of assets still pending.
+        :param budget: Time in seconds this call may take.
+        """
+        deadline = time.perf_counter() + budget
+        for key, future in tuple(self._pending.items()):
+            if time.perf_counter() >= deadline:
+                break
+            if future.done():
+                self._finish(key)
+        if not self._pending:
+            self._queued = 0
+        return len(self._pending)
+
+    def _finish(self, key: str) -> arcade.Texture:
+        texture = self._pending.pop(key).result()
+        if key.startswith(f"{BACKGROUND_FOLDER}/"):
+            arcade.get_window().ctx.default_atlas.add(texture)
+            self._store_background(key, texture)
+        else:
+            self.atlas.add(texture)
+            self._textures[key] = texture
+        return texture
+
+    def texture(self, *parts: str) -> arcade.Texture:
+        """
+        Returns the texture of a sprite image, decoding and packing it into the atlas on first use.
+        :param parts: Path of the image relative to ``Paths.ASSETS``.
+        """
+        key = "/".join(parts)
+        texture = self._textures.get(key)
+        if texture is None:
+            if key in self._pending:
+                return self._finish(key)
+            texture = self._decode_sprite(parts)
+            self.atlas.add(texture)
+            self._textures[key] = texture
+        return texture
+
+    def frames(self, *parts: str, frame_width: int, frame_height: int) -> tuple[arcade.Texture, ...]:
+        """
+        Slices a sprite sheet into frames, row by row from the top left, and packs them into the atlas once.
+        :param parts: Path of the sheet relative to ``Paths.ASSETS``.
+        :param frame_width: Width of a frame in pixels.
+        :param frame_height: Height of a frame in pixels.
+        """
+        key = ("/".join(parts), frame_width, frame_height)
+        frames = self._frames.get(key)
+        if frames is None:
+            with PIL.Image.open(self.path(*parts)) as image:
+                sheet = image.convert("RGBA")
+            columns, rows = sheet.width // frame_width, sheet.height // frame_height
+            frames = tuple(
+                arcade.Texture(
+                    sheet.crop((x, y, x + frame_width, y + frame_height)),
+                    hash=f"{key[0]}#{index}@{frame_width}x{frame_height}",
+                )
+                for index, (y, x) in enumerate(
+                    (row * frame_height, column * frame_width) for row in range(rows) for column in range(columns)
+                )
+            )
+            for frame in frames:
+                self.atlas.add(frame)
+            self._frames[key] = frames
+        return frames
+
+    def sprite(self, *parts: str, **kwargs: t.Any) -> arcade.Sprite:
+        return arcade.Sprite(self.texture(*parts), **kwargs)
+
+    def sprite_list(self, **kwargs: t.Any) -> arcade.SpriteList[arcade.Sprite]:
+        """Creates a sprite list drawing from the shared atlas."""
+        return arcade.SpriteList(atlas=self.atlas, **kwargs)
+
+    def background(self, *parts: str) -> arcade.Texture:
+        """
+        Returns a full screen background, decoded at screen size and kept in an LRU cache.
+        :param parts: Path of the image relative to ``Paths.ASSETS``.
+        """
+        key = "/".join(parts)
+        texture = self._backgrounds.get(key)
+        if texture is not None:
+            self._backgrounds.move_to_end(key)
+            return texture
+        if key in self._pending:
+            return self._finish(key)
+        texture = self._decode_background(parts, self._screen_size())
+        self._store_background(key, texture)
+        return texture
+
+    def background_async(self, *parts: str) -> t.Optional[arcade.Texture]:
+        """
+        Returns a background if it is decoded, otherwise starts decoding it on a worker thread and returns ``None``.
+        :param parts: Path of the image relative to ``Paths.ASSETS``.
+        """
+        key = "/".join(parts)
+        texture = self._backgrounds.get(key)
+        if texture is not None:
+            self._backgrounds.move_to_end(key)
+            return texture
+        future = self._pending.get(key)
+        if future is None:
+            self._pending[key] = self._executor.submit(self._decode_background, parts, self._screen_size())
+            self._queued += 1
+        elif future.done():
+            return self._finish(key)
+        return None
+
+    def _store_background(self, key: str, texture: arcade.Texture) -> None:
+        self._backgrounds[key] = texture
+        while len(self._backgrounds) > self.max_backgrounds:
+            _, evicted = self._backgrounds.popitem(last=False)
+            self._release(evicted)
+
+    @staticmethod
+    def _screen_size() -> BackgroundSize:
+        window = arcade.get_window()
+        return window.width, window.height
+
+    @classmethod
+    def _decode_sprite(cls, parts: tuple[str, ...]) -> arcade.Texture:
+        # safe off the main thread, the texture only touches the GPU once it is added to an atlas
+        with PIL.Image.open(cls.path(*parts)) as image:
+            return arcade.Texture(image.convert("RGBA"), hash="/".join(parts))
+
+    @classmethod
+    def _decode_background(cls, parts: tuple[str, ...], size: BackgroundSize) -> arcade.Texture:
+        with PIL.Image.open(cls.path(*parts)) as image:
+            image.draft("RGB", size)
+            scaled = image.convert("RGBA").resize(size, PIL.Image.BILINEAR, reducing_gap=2.0)
+        return arcade.Texture(
+            scaled, hit_box_algorithm=arcade.hitbox.algo_bounding_box, hash=f"background:{'/'.join(parts)}"
+        )
+
+    @staticmethod
+    def _release(texture: arcade.Texture) -> None:
+        atlas = arcade.get_window().ctx.default_atlas
+        if atlas.has_texture(texture):
+            atlas.remove(texture)
+        texture.remove_from_cache()
@@ -0,0 +1,222 @@
+import collections
+import concurrent.futures
+import pathlib
+import time
+import typing as t
+
+import pyglet.media
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Paths
+
+__all__: tuple[str, ...] = ("AudioEngine",)
+
+
+AUDIO_SUFFIXES: t.Final[frozenset[str]] = frozenset((".wav", ".ogg", ".mp3", ".flac"))
+EFFECTS_FOLDER: t.Final[str] = "sounds"
+ASSETS: t.Final[pathlib.Path] = t.cast(pathlib.Path, Paths.ASSETS)
+
+
+class _Voice:
+    """One reusable player of the pool and what it is playing."""
+
+    __slots__ = ("player", "volume", "priority", "started", "key")
+
+    def __init__(self) -> None:
+        self.player = pyglet.media.Player()
+        self.volume = 1.0
+        self.priority = 0
+        self.started = 0.0
+        self.key = ""
+
+    @property
+    def busy(self) -> bool:
+        return self.player.source is not None
+
+
+class AudioEngine:
+    """
+    Streams music from disk and plays short effects on a fixed pool of voices.
+    Effects are decoded once on a worker thread into a memory-capped LRU cache, playing one never waits for it:
+    an effect which isn't decoded yet is dropped, so effects should be preloaded. The voices are reused,
+    although pyglet deletes and recreates the driver player behind a voice whenever its effect changes.
+    When every voice is busy the lowest priority, oldest voice is taken over, or the new effect is dropped
+    if everything playing matters more.
+    :param music_volume: Volume of the music, from ``0`` to ``1``.
+    :param effects_volume: Volume every effect is scaled by, from ``0`` to ``1``.
+    :param voices: Most effects playing at once.
+    :param cache_bytes: Most decoded effect data kept in memory.
+    :param repeat_interval: Seconds during which replaying the same effect is ignored.
+    """
+
+    def __init__(
+        self,
+        music_volume: float = GameConfig.MUSIC_VOLUME,
+        effects_volume: float = GameConfig.EFFECTS_VOLUME,
+        voices: int = GameConfig.AUDIO_VOICES,
+        cache_bytes: int = GameConfig.AUDIO_CACHE_BYTES,
+        repeat_interval: float = GameConfig.AUDIO_REPEAT_INTERVAL,
+    ) -> None:
+        self._music_volume = music_volume
+        self._effects_volume = effects_volume
+        self.max_voices = voices
+        self.max_cache_bytes = cache_bytes
+        self.repeat_interval = repeat_interval
+        self.music: t.Optional[pyglet.media.Player] = None
+        self._voices: list[_Voice] = []
+        self._effects: collections.OrderedDict[str, pyglet.media.StaticSource] = collections.OrderedDict()
+        self._cache_bytes = 0
+        self._last_played: dict[str, float] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio")
+        self._pending: dict[str, concurrent.futures.Future[pyglet.media.StaticSource]] = {}
+
+    @staticmethod
+    def path(*parts: str) -> str:
+        return ASSETS.joinpath(*parts).as_posix()
+
+    @property
+    def music_volume(self) -> float:
+        return self._music_volume
+
+    @music_volume.setter
+    def music_volume(self, volume: float) -> None:
+        self._music_volume = volume
+        if self.music is not None:
+            self.music.volume = volume
+
+    @property
+    def effects_volume(self) -> float:
+        return self._effects_volume
+
+    @effects_volume.setter
+    def effects_volume(self, volume: float) -> None:
+        self._effects_volume = volume
+        for voice in self._voices:
+            voice.player.volume = voice.volume * volume
+
+    @property
+    def cache_bytes(self) -> int:
+        """Size of the decoded effects currently cached."""
+        return self._cache_bytes
+
+    def play_music(self, *parts: str, loop: bool = True) -> None:
+        """
+        Replaces the current music with a track decoded bit by bit while it plays.
+        :param parts: Path of the track relative to ``Paths.ASSETS``.
+        :param loop: Whether to restart the track when it ends.
+        """
+        self.stop_music()
+        self.music = pyglet.media.Player()
+        self.music.volume = self._music_volume
+        self.music.loop = loop
+        self.music.queue(pyglet.media.load(self.path(*parts), streaming=True))
+        self.music.play()
+
+    def stop_music(self) -> None:
+        if self.music is not None:
+            self.music.pause()
+            self.music.delete()
+            self.music = None
+
+    def preload(self, folder: str = EFFECTS_FOLDER) -> None:
+        """Starts decoding every effect of an asset folder which isn't cached yet on a worker thread."""
+        root = ASSETS / folder
+        if not root.is_dir():
+            return
+        for path in sorted(root.rglob("*")):
+            if path.suffix.lower() not in AUDIO_SUFFIXES:
+                continue
+            parts = path.relative_to(ASSETS).parts
+            key = "/".join(parts)
+            if key not in self._effects and key not in self._pending:
+                self._pending[key] = self._executor.submit(self._decode, parts)
+
+    @classmethod
+    def _decode(cls, parts: tuple[str, ...]) -> pyglet.media.StaticSource:
+        return pyglet.media.StaticSource(pyglet.media.load(cls.path(*parts), streaming=False))
+
+    @staticmethod
+    def _size(source: pyglet.media.StaticSource) -> int:
+        audio_format = source.audio_format
+        return int(source.duration * audio_format.bytes_per_second) if audio_format else 0
+
+    def effect(self, *parts: str) -> t.Optional[pyglet.media.StaticSource]:
+        """
+        Returns a decoded effect, or ``None`` while it is decoded on the worker thread, which starts on first use.
+        :param parts: Path of the effect relative to ``Paths.ASSETS``.
+        """
+        key = "/".join(parts)
+        source = self._effects.get(key)
+        if source is not None:
+            self._effects.move_to_end(key)
+            return source
+        future = self._pending.get(key)
+        if future is None:
+            self._pending[key] = self._executor.submit(self._decode, parts)
+            return None
+        if not future.done():
+            return None
+        del self._pending[key]
+        source = future.result()
+        self._effects[key] = source
+        self._cache_bytes += self._size(source)
+        # the newest effect stays even if it alone is over the cap, voices playing an evicted one keep its data
+        while self._cache_bytes > self.max_cache_bytes and len(self._effects) > 1:
+            _, evicted = self._effects.popitem(last=False)
+            self._cache_bytes -= self._size(evicted)
+        return source
+
+    def _voice(self, priority: int) -> t.Optional[_Voice]:
+        """Returns an idle voice, a new one while the pool isn't full, or the voice to take over."""
+        for voice in self._voices:
+            if not voice.busy:
+                return voice
+        if len(self._voices) < self.max_voices:
+            voice = _Voice()
+            self._voices.append(voice)
+            return voice
+        if not self._voices:
+            return None
+        victim = min(self._voices, key=lambda voice: (voice.priority, voice.started))
+        return victim if victim.priority <= priority else None
+
+    def play(self, *parts: str, priority: int = 0, volume: float = 1.0) -> bool:
+        """
+        Plays an effect on the voice pool, returns whether it got a voice and was already decoded.
+        :param parts: Path of the effect relative to ``Paths.ASSETS``.
+        :param priority: Voices of a lower priority are taken over first, equal ones from the oldest.
+        :param volume: Volume of this effect, scaled by :attr:`effects_volume`.
+        """
+        key = "/".join(parts)
+        now = time.perf_counter()
+        # a burst of the same effect sounds the same as one, but would take every voice
+        if now - self._last_played.get(key, -self.repeat_interval) < self.repeat_interval:
+            return False
+        source = self.effect(*parts)
+        if source is None:
+            return False
+        voice = self._voice(priority)
+        if voice is None:
+            return False
+        player = voice.player
+        if voice.busy:
+            player.pause()
+            player.next_source()
+        player.volume = volume * self._effects_volume
+        player.queue(source)
+        player.play()
+        voice.volume, voice.priority, voice.started, voice.key = volume, priority, now, key
+        self._last_played[key] = now
+        return True
+
+    def playing(self) -> int:
+        """Number of voices currently playing an effect."""
+        return sum(voice.busy for voice in self._voices)
+
+    def stop_all(self) -> None:
+        """Stops the music and every effect."""
+        self.stop_music()
+        for voice in self._voices:
+            if voice.busy:
+                voice.player.pause()
+                voice.player.next_source()
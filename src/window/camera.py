@@ -0,0 +1,124 @@
+import math
+
+import arcade
+
+from src.utils.constants import GameConfig
+
+__all__: tuple[str, ...] = ("CameraController",)
+
+Rect = tuple[float, float, float, float]
+
+
+def _approach(value: float, target: float, blend: float, epsilon: float) -> float:
+    value += (target - value) * blend
+    return target if abs(target - value) < epsilon else value
+
+
+class CameraController:
+    """
+    Drives a camera that smoothly follows a target over the map, zooms through fixed levels and stays in bounds.
+    The visible world rectangle is set as the camera projection, so the camera position and scale are never used.
+    Nothing is recomputed once the view caught up with its target, until the target, zoom or viewport change.
+    :param camera: Camera whose projection is driven.
+    :param width: Width of the viewport in pixels.
+    :param height: Height of the viewport in pixels.
+    :param bounds: Width and height of the map in pixels, the view never shows past them.
+    :param smoothing: How fast the view catches up with its target per second, ``0`` snaps to it.
+    :param zoom_levels: World pixels per screen pixel, in increasing order, the view can zoom through.
+    """
+
+    def __init__(
+        self,
+        camera: arcade.SimpleCamera,
+        width: int,
+        height: int,
+        bounds: tuple[float, float] = (
+            GameConfig.MAP_SIZE_X * GameConfig.TILE_SIZE,
+            GameConfig.MAP_SIZE_Y * GameConfig.TILE_SIZE,
+        ),
+        smoothing: float = GameConfig.CAMERA_SMOOTHING,
+        zoom_levels: tuple[float, ...] = GameConfig.CAMERA_ZOOM_LEVELS,
+    ) -> None:
+        self.camera = camera
+        self.width = width
+        self.height = height
+        self.bounds = bounds
+        self.smoothing = smoothing
+        self.zoom_levels = zoom_levels
+        self.zoom_index = min(range(len(zoom_levels)), key=lambda index: abs(zoom_levels[index] - 1))
+        self.zoom: float = zoom_levels[self.zoom_index]
+        self.center_x: float = bounds[0] / 2
+        self.center_y: float = bounds[1] / 2
+        self.target_x, self.target_y = self.center_x, self.center_y
+        self.rect: Rect = (0, 0, width, height)
+        # bumped whenever :attr:`rect` changes, so other systems can skip their culling
+        self.version = 0
+        self._dirty = True
+
+    @property
+    def target_zoom(self) -> float:
+        return self.zoom_levels[self.zoom_index]
+
+    def follow(self, x: float, y: float) -> None:
+        """Sets the world position the view is centered on."""
+        if (x, y) != (self.target_x, self.target_y):
+            self.target_x, self.target_y = x, y
+            self._dirty = True
+
+    def snap(self) -> None:
+        """Jumps to the target and zoom level without smoothing on the next :meth:`update`."""
+        self.center_x, self.center_y, self.zoom = self.target_x, self.target_y, self.target_zoom
+        self._dirty = True
+
+    def zoom_in(self) -> None:
+        self.set_zoom_level(self.zoom_index - 1)
+
+    def zoom_out(self) -> None:
+        self.set_zoom_level(self.zoom_index + 1)
+
+    def set_zoom_level(self, index: int) -> None:
+        index = min(max(index, 0), len(self.zoom_levels) - 1)
+        if index != self.zoom_index:
+            self.zoom_index = index
+            self._dirty = True
+
+    def resize(self, width: int, height: int) -> None:
+        self.width, self.height = width, height
+        self._dirty = True
+
+    def screen_to_world(self, x: float, y: float) -> tuple[float, float]:
+        """Converts a position in window pixels to world pixels."""
+        left, bottom, _, _ = self.rect
+        return left + x * self.zoom, bottom + y * self.zoom
+
+    def _clamped(self) -> Rect:
+        width, height = self.width * self.zoom, self.height * self.zoom
+        bounds_width, bounds_height = self.bounds
+        # a view larger than the map is centered on it instead
+        if width >= bounds_width:
+            left = (bounds_width - width) / 2
+        else:
+            left = min(max(self.center_x - width / 2, 0), bounds_width - width)
+        if height >= bounds_height:
+            bottom = (bounds_height - height) / 2
+        else:
+            bottom = min(max(self.center_y - height / 2, 0), bounds_height - height)
+        return left, bottom, width, height
+
+    def update(self, delta_time: float) -> bool:
+        """Moves the view towards its target, returns whether the visible rectangle changed."""
+        if not self._dirty:
+            return False
+        blend = 1 - math.exp(-self.smoothing * delta_time) if self.smoothing else 1.0
+        self.center_x = _approach(self.center_x, self.target_x, blend, 0.01)
+        self.center_y = _approach(self.center_y, self.target_y, blend, 0.01)
+        self.zoom = _approach(self.zoom, self.target_zoom, blend, 1e-4)
+        self._dirty = (self.center_x, self.center_y, self.zoom) != (self.target_x, self.target_y, self.target_zoom)
+        rect = self._clamped()
+        if rect == self.rect:
+            return False
+        self.rect = rect
+        left, bottom, width, height = rect
+        self.camera.projection = left, left + width, bottom, bottom + height
+        self.version += 1
+        return True
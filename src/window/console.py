@@ -0,0 +1,90 @@
+import collections
+import itertools
+import typing as t
+
+import arcade
+import pyglet.graphics
+
+from src.utils.constants import GameConfig
+
+__all__: tuple[str, ...] = ("DebugConsole",)
+
+COMMAND_COLOR: t.Final[tuple[int, int, int]] = (200, 200, 200)
+OUTPUT_COLOR: t.Final[tuple[int, int, int]] = (255, 255, 255)
+BACKGROUND_COLOR: t.Final[tuple[int, int, int, int]] = (0, 100, 0, 150)
+ConsoleLine = tuple[str, bool]
+
+
+class DebugConsole:
+    """
+    Scrollback of the debug console drawn above its input field.
+    Lines are kept in a bounded buffer and shown through a fixed pool of text rows sharing one batch,
+    rows are only re-laid out when the line they show changed.
+    :param scrollback: Number of lines kept.
+    :param visible_lines: Number of rows drawn.
+    :param line_height: Height of a row in pixels, the input field takes the bottom row.
+    """
+
+    def __init__(
+        self,
+        scrollback: int = GameConfig.CONSOLE_SCROLLBACK,
+        visible_lines: int = GameConfig.CONSOLE_VISIBLE_LINES,
+        line_height: int = GameConfig.CONSOLE_LINE_HEIGHT,
+    ) -> None:
+        self.lines: collections.deque[ConsoleLine] = collections.deque(maxlen=scrollback)
+        self.line_height = line_height
+        self.camera = arcade.SimpleCamera()
+        self.batch = pyglet.graphics.Batch()
+        self._rows = [
+            arcade.Text("", 4, line_height * (index + 1) + line_height / 2, anchor_y="center", batch=self.batch)
+            for index in range(visible_lines)
+        ]
+        self._shown: list[t.Optional[ConsoleLine]] = [None] * visible_lines
+        self._dirty = False
+
+    def write(self, text: str, command: bool = False) -> None:
+        self.lines.append((text, command))
+        self._dirty = True
+
+    def clear(self) -> None:
+        self.lines.clear()
+        self._dirty = True
+
+    def execute(self, command: str, namespace: dict[str, t.Any]) -> None:
+        """
+        Evaluates a command and writes it to the scrollback with its result.
+        :param command: Python expression to evaluate.
+        :param namespace: Names the expression can use.
+        """
+        self.write(f">{command}", command=True)
+        try:
+            result = eval(command, namespace)
+        except Exception as error:
+            self.write(f"{type(error).__name__}: {error}")
+        else:
+            self.write(str(result))
+
+    def _layout(self) -> None:
+        # the newest line goes in the bottom row
+        recent = list(itertools.islice(reversed(self.lines), len(self._rows)))
+        for index, row in enumerate(self._rows):
+            line = recent[index] if index < len(recent) else None
+            if line == self._shown[index]:
+                continue
+            self._shown[index] = line
+            text, command = line or ("", False)
+            row.text = text
+            row.color = COMMAND_COLOR if command else OUTPUT_COLOR
+        self._dirty = False
+
+    def draw(self) -> None:
+        if self._dirty:
+            self._layout()
+        used = min(len(self.lines), len(self._rows))
+        if not used:
+            return
+        self.camera.use()
+        window = arcade.get_window()
+        bottom = self.line_height
+        arcade.draw_lrtb_rectangle_filled(0, window.width, bottom + used * self.line_height, bottom, BACKGROUND_COLOR)
+        self.batch.draw()
@@ -0,0 +1,49 @@
+import typing as t
+
+import arcade
+import numpy as np
+import numpy.typing as npt
+
+from src.world.entities import EntityStore
+
+__all__: tuple[str, ...] = ("EntitySpriteList",)
+
+
+class EntitySpriteList(arcade.SpriteList[arcade.Sprite]):
+    """
+    Sprite list mirroring an :class:`EntityStore`, one sprite per entity sharing the same texture.
+    Positions are copied straight into the GPU position buffer in one pass, so the sprites' own
+    ``position`` isn't updated and the store stays the source of truth for hit tests.
+    :param store: Entities to draw.
+    :param texture: Texture of every entity sprite.
+    """
+
+    def __init__(self, store: EntityStore, texture: arcade.Texture, **kwargs: t.Any) -> None:
+        super().__init__(**kwargs)
+        self.store = store
+        self.texture = texture
+        self._slots: npt.NDArray[np.intp] = np.zeros(0, np.intp)
+
+    def sync(self, alpha: float = 1.0) -> None:
+        """
+        Writes the interpolated entity positions into the position buffer.
+        :param alpha: Fraction of a tick elapsed since the last simulation update.
+        """
+        count = self.store.count
+        if count != len(self._slots):
+            self._resize(count)
+        if not count:
+            return
+        # the view must not outlive this call, the buffer can't grow while it is exported
+        data = np.frombuffer(self._sprite_pos_data, np.float32).reshape(-1, 3)
+        data[self._slots, :2] = self.store.interpolate(alpha)
+        del data
+        self._sprite_pos_changed = True
+
+    def _resize(self, count: int) -> None:
+        # entities are interchangeable on screen, so despawns just drop the last sprites
+        while len(self) > count:
+            self.pop()
+        while len(self) < count:
+            self.append(arcade.Sprite(self.texture))
+        self._slots = np.fromiter((self.sprite_slot[sprite] for sprite in self.sprite_list), np.intp, count)
@@ -0,0 +1,330 @@
+import pathlib
+import typing as t
+
+import arcade
+import arcade.gui
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Inputs, Paths
+from src.window.animation import Animator
+from src.window.camera import CameraController
+from src.window.console import DebugConsole
+from src.window.entities import EntitySpriteList
+from src.window.lighting import LightingSystem
+from src.window.overlay import ProfilerOverlay
+from src.window.particles import ParticleSystem
+from src.window.streaming import ChunkStreamer
+from src.world.chunks import ChunkedMap
+from src.world.generation import generate_map
+from src.world.inputs import InputBus
+from src.world.saves import SaveWriter, load_latest
+from src.world.simulation import Simulation
+from src.world.timestep import FixedTimestep
+from src.world.workers import PathJob, WorkerPool
+
+if t.TYPE_CHECKING:
+    from src.window.window import Window
+
+__all__: tuple[str, ...] = ("Game",)
+
+
+class Game(arcade.View):
+    """
+    Main game logic goes here.
+    :param main_window: Main window in which it showed.
+    """
+
+    def __init__(self, main_window: "Window") -> None:
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.game_scene: t.Optional[arcade.Scene] = None
+        self.camera_sprite: t.Optional[arcade.Sprite] = None
+        self.simulation: t.Optional[Simulation] = None
+        self.timestep = FixedTimestep()
+        self.camera: t.Optional[arcade.Camera] = None
+        self.camera_controller: t.Optional[CameraController] = None
+        self.lighting: t.Optional[LightingSystem] = None
+        self.particles: t.Optional[ParticleSystem] = None
+        self.screen_center_x: float = 0
+        self.screen_center_y: float = 0
+        self.manager: t.Optional[arcade.gui.UIManager] = None
+        self.v_box: t.Optional[arcade.gui.UIBoxLayout] = None
+        self.console_active: bool = False
+        self.debugging_console: t.Optional[arcade.gui.UIInputText] = None
+        self.debugging_console_tex_inp: t.Optional[arcade.Texture] = None
+        self.debugging_console_tex: t.Optional[arcade.gui.UIWidget] = None
+        self.console: t.Optional[DebugConsole] = None
+
+        self.player_list: t.Optional[arcade.SpriteList[arcade.Sprite]] = None
+        self.entity_list: t.Optional[EntitySpriteList] = None
+        self.world: t.Optional[ChunkedMap] = None
+        self.chunk_streamer: t.Optional[ChunkStreamer] = None
+        self.profiler = self.main_window.profiler
+        self.profiler_overlay: t.Optional[ProfilerOverlay] = None
+        self.saves = SaveWriter(t.cast(pathlib.Path, Paths.SAVES))
+        self.input_bus: t.Optional[InputBus] = None
+        self.animator = Animator()
+        self.workers = WorkerPool(processes=True)
+        self.autosave_elapsed: float = 0
+        self._streamed_version = -1
+
+    @property
+    def tic(self) -> int:
+        return self.simulation.tic if self.simulation else 0
+
+    def on_show_view(self) -> None:
+        """Called when the current is switched to this view, :class:`LoadingView` already ran :meth:`setup`."""
+
+    def on_hide_view(self) -> None:
+        """Called when another view replaces this one or the window closes."""
+        self.workers.close()
+
+    def setup_stages(self) -> tuple[t.Callable[[], None], ...]:
+        """Returns the steps of :meth:`setup`, so a loading view can spread them over several frames."""
+        return self._setup_console, self._setup_lighting, self._setup_world, self._setup_players, self._setup_profiler
+
+    def setup(self) -> None:
+        """Set up the game here. Call this function to restart the game."""
+        for stage in self.setup_stages():
+            stage()
+
+    def _setup_console(self) -> None:
+        self.manager = arcade.gui.UIManager()
+        self.v_box = arcade.gui.UIBoxLayout()
+        self.debugging_console = arcade.gui.UIInputText(text=">", width=self.main_window.width, height=25)
+        size = GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT
+        tex = arcade.texture.Texture.create_empty("tex creator", size=size)
+        self.debugging_console_tex_inp = tex.create_filled(
+            color=(100, 0, 0, 150),
+            name="debug console in",
+            size=(self.main_window.width, 25),
+        )
+        self.debugging_console_tex = self.debugging_console.with_background(texture=self.debugging_console_tex_inp)
+        self.v_box.add(self.debugging_console_tex)
+        self.manager.add(arcade.gui.UIAnchorLayout(children=(self.v_box,), anchor_y="bottom"))
+        self.manager.enable()
+        self.console = DebugConsole()
+
+    def _setup_world(self) -> None:
+        self.game_scene = arcade.Scene()
+        self.camera = arcade.Camera(anchor=(self.main_window.width, self.main_window.height))
+        replay = self.main_window.replay
+        self.world = replay.generate_map() if replay else generate_map()
+        assets = self.main_window.assets
+        self.chunk_streamer = ChunkStreamer(self.world, self.game_scene, assets.sprite_list, before="Entities")
+        self.camera_sprite = assets.sprite("tiles", "pnj.png")
+        self.simulation = Simulation(self.world, (self.camera_sprite.width, self.camera_sprite.height))
+        self.camera_sprite.position = self.simulation.camera.position
+        record = self.main_window.record_path is not None
+        self.input_bus = self.main_window.input_bus = InputBus(self.simulation, record, replay)
+        # results of workers land on whichever tick they finish by, which a recording couldn't reproduce
+        self.simulation.paths.offloaded = not (record or replay)
+        entity_texture = assets.texture("tiles", "pnj.png")
+        self.entity_list = EntitySpriteList(self.simulation.entities, entity_texture, atlas=assets.atlas)
+        self.game_scene.add_sprite_list("Entities", sprite_list=self.entity_list)
+        self.game_scene.add_sprite("Camera", self.camera_sprite)
+        bounds = self.world.pixel_width, self.world.pixel_height
+        self.camera_controller = CameraController(self.camera, self.main_window.width, self.main_window.height, bounds)
+        self.camera_controller.follow(*self.camera_sprite.position)
+        self.camera_controller.snap()
+        self.camera_controller.update(0)
+        self.center_camera_to_camera()
+        t.cast(LightingSystem, self.lighting).update(*self.camera_controller.rect)
+
+    def _setup_lighting(self) -> None:
+        self.lighting = LightingSystem(self.main_window.width, self.main_window.height)
+        self.particles = ParticleSystem()
+        self.lighting.layer.light_sources.append(self.particles.draw_lights)
+
+    def _setup_players(self) -> None:
+        self.player_list = self.main_window.assets.sprite_list()
+
+        self.player_sprite = self.main_window.assets.sprite("tiles", "pnj.png")
+        self.player_sprite.center_x = 64
+        self.player_sprite.center_y = 128
+        self.player_list.append(self.player_sprite)
+
+    def _setup_profiler(self) -> None:
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+
+    def on_draw(self) -> None:
+        """Render the screen."""
+        profiler = self.profiler
+        with profiler.phase("draw"):
+            self.clear()
+            camera = t.cast(arcade.Camera, self.camera)
+            with profiler.phase("draw.camera"):
+                t.cast(EntitySpriteList, self.entity_list).sync(self.timestep.alpha)
+                camera.use()
+            lighting = t.cast(LightingSystem, self.lighting)
+            game_scene = t.cast(arcade.Scene, self.game_scene)
+            with profiler.phase("draw.scene"), lighting.layer:
+                game_scene.draw()
+                with profiler.phase("draw.particles"):
+                    t.cast(ParticleSystem, self.particles).draw()
+                if self.main_window.mouse_left_is_pressed:
+                    self.draw_picked()
+            with profiler.phase("draw.lights"):
+                lighting.draw()
+            manager = t.cast(arcade.gui.UIManager, self.manager)
+            if self.console_active:
+                with profiler.phase("draw.gui"):
+                    manager.draw()
+
+            assert self.player_list
+            with profiler.phase("draw.players"):
+                self.player_list.draw()
+            if self.console_active:
+                # last in the frame since the console switches to its own screen space camera
+                with profiler.phase("draw.console"):
+                    t.cast(DebugConsole, self.console).draw()
+        t.cast(ProfilerOverlay, self.profiler_overlay).draw()
+
+    def on_key_press(self, symbol: int, modifiers: int) -> None:
+        """Called whenever a key is pressed."""
+        simulation = t.cast(Simulation, self.simulation)
+        input_bus = t.cast(InputBus, self.input_bus)
+        manager = t.cast(arcade.gui.UIManager, self.manager)
+        debugging_console = t.cast(arcade.gui.UIInputText, self.debugging_console)
+        console = t.cast(DebugConsole, self.console)
+        if symbol in (arcade.key.UP, arcade.key.W):
+            input_bus.push(Inputs.CAMERA_VELOCITY_Y, y=GameConfig.CAMERA_MOVEMENT_SPEED)
+        elif symbol in (arcade.key.DOWN, arcade.key.S):
+            input_bus.push(Inputs.CAMERA_VELOCITY_Y, y=-GameConfig.CAMERA_MOVEMENT_SPEED)
+        elif symbol in (arcade.key.LEFT, arcade.key.A):
+            input_bus.push(Inputs.CAMERA_VELOCITY_X, x=-GameConfig.CAMERA_MOVEMENT_SPEED)
+        elif symbol in (arcade.key.RIGHT, arcade.key.D):
+            input_bus.push(Inputs.CAMERA_VELOCITY_X, x=GameConfig.CAMERA_MOVEMENT_SPEED)
+        elif symbol == arcade.key.F3:
+            self.profiler.toggle()
+        elif symbol == arcade.key.F5:
+            self.saves.save(simulation, full=True)
+        elif symbol == arcade.key.F9 and not (input_bus.recording or input_bus.replay):
+            # loading would make a recorded or replayed session diverge
+            self.saves.flush()
+            self.workers.apply(simulation, wait=True)
+            if load_latest(self.saves.directory, simulation) is not None:
+                self.saves.reset()
+        elif symbol == arcade.key.F4:
+            manager.enable()
+            if self.console_active:
+                manager.disable()
+            self.console_active = not self.console_active
+        elif symbol == arcade.key.ENTER:
+            if not self.console_active:
+                return
+            command = debugging_console.text[1:]
+            if command in ("clear", "cls"):
+                console.clear()
+            else:
+                console.execute(command, {"self": self, "arcade": arcade, "GameConfig": GameConfig})
+            debugging_console.text = ">"
+            debugging_console.trigger_full_render()
+
+    def on_key_release(self, key: int, _: t.Any) -> None:
+        """Called when the user releases a key."""
+        input_bus = t.cast(InputBus, self.input_bus)
+        if key in (arcade.key.UP, arcade.key.W):
+            input_bus.push(Inputs.CAMERA_VELOCITY_Y, y=0)
+        elif key in (arcade.key.DOWN, arcade.key.S):
+            input_bus.push(Inputs.CAMERA_VELOCITY_Y, y=0)
+        elif key in (arcade.key.LEFT, arcade.key.A):
+            input_bus.push(Inputs.CAMERA_VELOCITY_X, x=0)
+        elif key in (arcade.key.RIGHT, arcade.key.D):
+            input_bus.push(Inputs.CAMERA_VELOCITY_X, x=0)
+
+    def on_mouse_drag(self, x: int, y: int, dx: int, dy: int, _buttons: int, _modifiers: int) -> None:
+        """Called when the mouse is dragged."""
+        input_bus = t.cast(InputBus, self.input_bus)
+        # scaled so the map follows the cursor whatever the zoom
+        zoom = t.cast(CameraController, self.camera_controller).zoom
+        if GameConfig.INVERT_MOUSE:
+            input_bus.push(Inputs.CAMERA_MOVE, -dx * zoom, -dy * zoom)
+        else:
+            input_bus.push(Inputs.CAMERA_MOVE, dx * zoom, dy * zoom)
+
+    def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int) -> None:
+        """Called when the mouse wheel is scrolled, zooms the camera one level in or out."""
+        camera_controller = t.cast(CameraController, self.camera_controller)
+        if scroll_y > 0:
+            camera_controller.zoom_in()
+        elif scroll_y < 0:
+            camera_controller.zoom_out()
+
+    def on_resize(self, width: int, height: int) -> None:
+        if self.camera_controller is None:
+            return
+        t.cast(arcade.Camera, self.camera).resize(width, height, resize_projection=False)
+        t.cast(LightingSystem, self.lighting).layer.resize(width, height)
+        self.camera_controller.resize(width, height)
+
+    def on_mouse_motion(self, x: int, y: int, dx: int, dy: int) -> None:
+        self.main_window.mouse_x = x
+        self.main_window.mouse_y = y
+
+    def on_mouse_press(self, x: int, y: int, button: int, modifiers: int) -> None:
+        if button == arcade.MOUSE_BUTTON_LEFT:
+            self.main_window.mouse_left_is_pressed = True
+
+    def on_mouse_release(self, x: int, y: int, button: int, modifiers: int) -> None:
+        if button == arcade.MOUSE_BUTTON_LEFT:
+            self.main_window.mouse_left_is_pressed = False
+
+    def draw_picked(self) -> None:
+        """Outlines the entities under the mouse cursor."""
+        entities = t.cast(Simulation, self.simulation).entities
+        camera_controller = t.cast(CameraController, self.camera_controller)
+        x, y = camera_controller.screen_to_world(self.main_window.mouse_x, self.main_window.mouse_y)
+        for index in t.cast(Simulation, self.simulation).spatial.query_point(x, y).tolist():
+            (center_x, center_y), (half_width, half_height) = entities.position[index], entities.half_size[index]
+            arcade.draw_rectangle_outline(center_x, center_y, half_width * 2, half_height * 2, arcade.color.YELLOW, 2)
+
+    def center_camera_to_camera(self) -> None:
+        """Streams the chunks against the area the camera shows, call when it changed."""
+        left, bottom, width, height = t.cast(CameraController, self.camera_controller).rect
+        self.screen_center_x, self.screen_center_y = left, bottom
+        self._streamed_version = t.cast(ChunkedMap, self.world).version
+        t.cast(ChunkStreamer, self.chunk_streamer).update(left, bottom, width, height)
+
+    def on_update(self, delta_time: float) -> None:
+        """Movement and game logic"""
+        simulation = t.cast(Simulation, self.simulation)
+        input_bus = t.cast(InputBus, self.input_bus)
+        if input_bus.finished:
+            self.main_window.close()
+            arcade.exit()
+            return
+        # replays run one tick per frame, so every run renders the same frames whatever the machine
+        steps = 1 if input_bus.replay else self.timestep.advance(delta_time)
+        with self.profiler.phase("update"):
+            for _ in range(steps):
+                with self.profiler.phase("update.simulation"):
+                    input_bus.dispatch()
+                    self.workers.apply(simulation)
+                    simulation.update(self.timestep.step)
+            with self.profiler.phase("update.camera"):
+                camera_sprite = t.cast(arcade.Sprite, self.camera_sprite)
+                camera_sprite.position = simulation.camera.interpolate(self.timestep.alpha)
+                camera_controller = t.cast(CameraController, self.camera_controller)
+                camera_controller.follow(*camera_sprite.position)
+                # edited walls must be streamed again even when the view didn't move
+                moved = camera_controller.update(delta_time)
+                if moved or simulation.world.version != self._streamed_version:
+                    self.center_camera_to_camera()
+                # lights can be added, moved or removed while the view is still, culling returns early otherwise
+                t.cast(LightingSystem, self.lighting).update(*camera_controller.rect)
+            with self.profiler.phase("update.workers"):
+                job = PathJob.take(simulation.paths) if simulation.paths.offloaded else None
+                if job is not None:
+                    self.workers.publish(simulation)
+                    self.workers.submit(job)
+            with self.profiler.phase("update.animation"):
+                self.animator.update(simulation.tic)
+            with self.profiler.phase("update.particles"):
+                t.cast(ParticleSystem, self.particles).update(delta_time)
+            self.autosave_elapsed += delta_time
+            if self.autosave_elapsed >= GameConfig.AUTOSAVE_INTERVAL and not input_bus.replay:
+                self.autosave_elapsed = 0
+                with self.profiler.phase("update.autosave"):
+                    self.saves.save(simulation)
+        t.cast(ProfilerOverlay, self.profiler_overlay).update(delta_time)
@@ -0,0 +1,201 @@
+import array
+import typing as t
+
+from arcade import gl
+from arcade.experimental.lights import Light, LightLayer
+from arcade.types import Color
+
+from src.utils.constants import GameConfig
+
+__all__: tuple[str, ...] = (
+    "LightingSystem",
+    "PointLight",
+    "ScaledLightLayer",
+)
+
+Cell = tuple[int, int]
+
+
+class PointLight(Light):
+    """
+    Light whose color and attenuation are public, so :class:`ScaledLightLayer` can upload them itself.
+    :param center_x: X position of the light.
+    :param center_y: Y position of the light.
+    :param radius: Radius of the light.
+    :param color: Color of the light, its alpha is ignored.
+    :param mode: ``"hard"`` or ``"soft"`` falloff.
+    """
+
+    def __init__(
+        self,
+        center_x: float,
+        center_y: float,
+        radius: float = 50.0,
+        color: Color = (255, 255, 255),
+        mode: str = "hard",
+    ) -> None:
+        super().__init__(center_x, center_y, radius, color, mode)
+        self.color: tuple[int, int, int] = (color[0], color[1], color[2])
+        self.attenuation = Light.HARD if mode == "hard" else Light.SOFT
+
+
+class ScaledLightLayer(LightLayer):
+    """
+    Light layer whose light buffer is rendered at a fraction of the diffuse buffer resolution.
+    The combine pass samples it with linear filtering, so soft light falloff hides the lower resolution.
+    :param width: Width of the diffuse buffer.
+    :param height: Height of the diffuse buffer.
+    :param scale: Resolution of the light buffer relative to the diffuse buffer.
+    """
+
+    def __init__(self, width: int, height: int, scale: float = GameConfig.LIGHT_BUFFER_SCALE) -> None:
+        super().__init__(width, height)
+        self.scale = scale
+        self._light_buffer = self._create_light_buffer(width, height)
+        self._visible: list[PointLight] = []
+        # extra draws into the light buffer, called with the buffer scale after the point lights
+        self.light_sources: list[t.Callable[[float], None]] = []
+
+    def _create_light_buffer(self, width: int, height: int) -> gl.Framebuffer:
+        size = max(int(width * self.scale), 1), max(int(height * self.scale), 1)
+        return self.ctx.framebuffer(color_attachments=self.ctx.texture(size, components=3))
+
+    def resize(self, width: int, height: int) -> None:
+        super().resize(width, height)
+        self._light_buffer = self._create_light_buffer(width, height)
+
+    def set_visible(self, lights: list[PointLight]) -> None:
+        """
+        Replaces the lights that are rendered, the GPU buffer is only rewritten when the list changed.
+        :param lights: Lights to render.
+        """
+        if lights != self._visible:
+            self._visible = lights
+            self._rebuild = True
+
+    def invalidate(self) -> None:
+        self._rebuild = True
+
+    def draw(
+        self,
+        position: tuple[float, float] = (0, 0),
+        target: t.Optional[t.Any] = None,
+        ambient_color: Color = (64, 64, 64),
+    ) -> None:
+        """Same passes as :meth:`LightLayer.draw`, with :attr:`light_sources` drawn into the light buffer."""
+        if target is None:
+            target = self.window
+        lights = self._visible
+        if self._rebuild and lights:
+            data: list[float] = []
+            for light in lights:
+                data.extend(light.position)
+                data.append(light.radius)
+                data.append(light.attenuation)
+                data.extend(light.color)
+            while self._buffer.size < len(data) * self._stride:
+                self._buffer.orphan(double=True)
+            self._buffer.write(data=array.array("f", data))
+            self._rebuild = False
+
+        self._light_buffer.use()
+        self._light_buffer.clear()
+        self.ctx.enable(self.ctx.BLEND)
+        self.ctx.blend_func = self.ctx.BLEND_ADDITIVE
+        if lights:
+            self._light_program["position"] = position
+            self._vao.render(self._light_program, mode=self.ctx.POINTS, vertices=len(lights))  # type: ignore
+        for source in self.light_sources:
+            source(self.scale)
+        self.ctx.blend_func = self.ctx.BLEND_DEFAULT
+
+        target.use()
+        self._combine_program["diffuse_buffer"] = 0
+        self._combine_program["light_buffer"] = 1
+        self._combine_program["ambient"] = ambient_color[:3]
+        self._fbo.color_attachments[0].use(0)
+        self._light_buffer.color_attachments[0].use(1)
+        self._quad_fs.render(self._combine_program)
+
+
+class LightingSystem:
+    """
+    Point lights bucketed in a grid, only the lights overlapping the camera rectangle are drawn.
+    Lights must be moved through :meth:`move` so the grid and the GPU buffer stay in sync.
+    :param width: Width of the light layer.
+    :param height: Height of the light layer.
+    :param ambient_color: Light applied to the whole scene.
+    :param cell_size: Size in pixels of a grid cell.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        ambient_color: tuple[int, int, int] = GameConfig.AMBIENT_LIGHT,
+        cell_size: int = GameConfig.LIGHT_CELL_SIZE,
+    ) -> None:
+        self.layer = ScaledLightLayer(width, height)
+        self.ambient_color = ambient_color
+        self.cell_size = cell_size
+        self._cells: dict[Cell, list[PointLight]] = {}
+        self._max_radius: float = 0
+        self._rect: t.Optional[tuple[float, float, float, float]] = None
+
+    def __len__(self) -> int:
+        return sum(len(lights) for lights in self._cells.values())
+
+    def _cell(self, light: PointLight) -> Cell:
+        x, y = light.position
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, light: PointLight) -> PointLight:
+        self._cells.setdefault(self._cell(light), []).append(light)
+        self._max_radius = max(self._max_radius, light.radius)
+        self._rect = None
+        return light
+
+    def remove(self, light: PointLight) -> None:
+        cell = self._cell(light)
+        self._cells[cell].remove(light)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self._rect = None
+
+    def move(self, light: PointLight, x: float, y: float) -> None:
+        self.remove(light)
+        light.position = x, y
+        self.add(light)
+
+    def update(self, left: float, bottom: float, width: float, height: float) -> None:
+        """
+        Culls the lights against the camera rectangle, does nothing if neither the camera nor the lights changed.
+        :param left: Left edge of the visible area.
+        :param bottom: Bottom edge of the visible area.
+        :param width: Width of the visible area.
+        :param height: Height of the visible area.
+        """
+        rect = (left, bottom, width, height)
+        if rect == self._rect:
+            return
+        changed = self._rect is None
+        self._rect = rect
+        reach = self._max_radius
+        right, top = left + width, bottom + height
+        min_x, max_x = int((left - reach) // self.cell_size), int((right + reach) // self.cell_size)
+        min_y, max_y = int((bottom - reach) // self.cell_size), int((top + reach) // self.cell_size)
+        visible: list[PointLight] = []
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                for light in self._cells.get((cell_x, cell_y), ()):
+                    x, y = light.position
+                    radius = light.radius
+                    if x + radius >= left and x - radius <= right and y + radius >= bottom and y - radius <= top:
+                        visible.append(light)
+        self.layer.set_visible(visible)
+        if changed:
+            # moved lights keep their identity, so set_visible can't tell the buffer is stale
+            self.layer.invalidate()
+
+    def draw(self) -> None:
+        self.layer.draw(ambient_color=self.ambient_color)
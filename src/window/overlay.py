@@ -0,0 +1,55 @@
+import arcade
+
+from src.utils.constants import GameConfig
+from src.utils.profiler import FrameProfiler
+
+__all__: tuple[str, ...] = ("ProfilerOverlay",)
+
+
+class ProfilerOverlay:
+    """
+    Draws min/avg/p99 of every profiled phase in the top left corner of the screen.
+    The text is only re-laid out every ``refresh`` seconds.
+    :param profiler: Profiler to read the phases from.
+    :param refresh: Seconds between text updates.
+    """
+
+    def __init__(self, profiler: FrameProfiler, refresh: float = GameConfig.PROFILER_OVERLAY_REFRESH) -> None:
+        window = arcade.get_window()
+        self.profiler = profiler
+        self.refresh = refresh
+        self.camera = arcade.SimpleCamera()
+        self.text = arcade.Text(
+            "",
+            10,
+            window.height - 10,
+            arcade.color.WHITE,
+            font_size=10,
+            width=360,
+            font_name=("consolas", "courier new", "monospace"),
+            anchor_y="top",
+            multiline=True,
+        )
+        self._elapsed = refresh
+
+    def update(self, delta_time: float) -> None:
+        self._elapsed += delta_time
+        if not self.profiler.enabled or self._elapsed < self.refresh:
+            return
+        self._elapsed = 0
+        lines = [f"{'phase':<18}{'min':>7}{'avg':>7}{'p99':>7}"]
+        for name in self.profiler.phases:
+            stats = self.profiler.stats(name)
+            lines.append(f"{name:<18}{stats.min:>7.2f}{stats.avg:>7.2f}{stats.p99:>7.2f}")
+        self.text.text = "\n".join(lines)
+
+    def draw(self) -> None:
+        if not self.profiler.enabled:
+            return
+        self.camera.use()
+        top = self.text.y
+        bottom = top - self.text.content_height - 10
+        arcade.draw_lrtb_rectangle_filled(
+            0, self.text.x + self.text.content_width + 10, top + 10, bottom, (0, 0, 0, 160)
+        )
+        self.text.draw()
@@ -0,0 +1,257 @@
+import typing as t
+
+import arcade
+import arcade.gl
+import attrs
+import numpy as np
+import numpy.typing as npt
+
+from src.utils.constants import GameConfig
+
+__all__: tuple[str, ...] = (
+    "ParticleEmitter",
+    "ParticleKind",
+    "ParticlePool",
+    "ParticleSystem",
+)
+
+# layout of the GPU buffer, one point per particle
+VERTEX = np.dtype([("position", "<f4", 2), ("color", "u1", 4), ("size", "<f4")], align=False)
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform float size_scale;
+uniform float intensity;
+
+in vec2 in_position;
+in vec4 in_color;
+in float in_size;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_position, 0.0, 1.0);
+    gl_PointSize = in_size * size_scale;
+    v_color = vec4(in_color.rgb * intensity, in_color.a);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+
+out vec4 f_color;
+
+void main() {
+    float distance = length(gl_PointCoord - 0.5) * 2.0;
+    if (distance > 1.0) {
+        discard;
+    }
+    f_color = vec4(v_color.rgb, v_color.a * (1.0 - distance * distance));
+}
+"""
+
+
+@attrs.define(frozen=True, slots=True)
+class ParticleKind:
+    """
+    How the particles of one kind look and move, every kind is drawn with a single call.
+    :param color: Color at birth, the alpha fades out over the lifetime.
+    :param size: Diameter in pixels.
+    :param lifetime: Range of lifetimes in seconds.
+    :param speed: Range of initial speeds in pixels per second.
+    :param angle: Range of initial directions in degrees.
+    :param gravity: Vertical acceleration in pixels per second squared.
+    :param drag: Fraction of the velocity lost per second.
+    :param glow: Intensity the particles light the scene with, ``0`` keeps them out of the light layer.
+    :param capacity: Most particles of this kind alive at once, extra ones are dropped.
+    """
+
+    color: tuple[int, int, int, int] = (255, 255, 255, 255)
+    size: float = 4
+    lifetime: tuple[float, float] = (0.5, 1.0)
+    speed: tuple[float, float] = (60, 180)
+    angle: tuple[float, float] = (0, 360)
+    gravity: float = 0
+    drag: float = 0
+    glow: float = 0
+    capacity: int = GameConfig.PARTICLE_CAPACITY
+
+
+class ParticlePool:
+    """
+    Preallocated particles of one kind, the alive ones are kept packed at the front of the arrays.
+    :param kind: Kind of the particles.
+    :param rng: Generator the spawn parameters are drawn from.
+    """
+
+    def __init__(self, kind: ParticleKind, rng: np.random.Generator) -> None:
+        self.kind = kind
+        self.rng = rng
+        self.count = 0
+        self.vertices = np.zeros(kind.capacity, VERTEX)
+        self.velocity: npt.NDArray[np.float32] = np.zeros((kind.capacity, 2), np.float32)
+        self.age: npt.NDArray[np.float32] = np.zeros(kind.capacity, np.float32)
+        self.lifetime: npt.NDArray[np.float32] = np.ones(kind.capacity, np.float32)
+
+    def emit(self, x: float, y: float, count: int) -> int:
+        """Spawns up to ``count`` particles at a point and returns how many fit in the pool."""
+        kind = self.kind
+        start = self.count
+        count = min(count, kind.capacity - start)
+        if count <= 0:
+            return 0
+        stop = start + count
+        angles = np.radians(self.rng.uniform(*kind.angle, count))
+        speeds = self.rng.uniform(*kind.speed, count)
+        self.velocity[start:stop, 0] = np.cos(angles) * speeds
+        self.velocity[start:stop, 1] = np.sin(angles) * speeds
+        self.vertices["position"][start:stop] = x, y
+        self.vertices["color"][start:stop] = kind.color
+        self.vertices["size"][start:stop] = kind.size
+        self.age[start:stop] = 0
+        self.lifetime[start:stop] = self.rng.uniform(*kind.lifetime, count)
+        self.count = stop
+        return count
+
+    def update(self, delta_time: float) -> None:
+        count = self.count
+        if not count:
+            return
+        kind = self.kind
+        age = self.age[:count]
+        age += delta_time
+        alive = age < self.lifetime[:count]
+        if not alive.all():
+            # compact the survivors to the front, dead particles are simply overwritten later
+            survivors = int(alive.sum())
+            for array in (self.vertices, self.velocity, self.age, self.lifetime):
+                array[:survivors] = array[:count][alive]
+            count = self.count = survivors
+        velocity = self.velocity[:count]
+        if kind.drag:
+            velocity *= max(1 - kind.drag * delta_time, 0)
+        if kind.gravity:
+            velocity[:, 1] -= kind.gravity * delta_time
+        vertices = self.vertices[:count]
+        vertices["position"] += velocity * delta_time
+        vertices["color"][:, 3] = kind.color[3] * (1 - self.age[:count] / self.lifetime[:count])
+
+
+class ParticleEmitter:
+    """
+    Continuously spawns particles at a sprite, see :meth:`ParticleSystem.attach`.
+    :param kind: Kind of the particles.
+    :param sprite: Sprite the particles are spawned at.
+    :param rate: Particles per second.
+    :param offset: Position of the emitter relative to the sprite center.
+    """
+
+    __slots__ = ("kind", "sprite", "rate", "offset", "_carry")
+
+    def __init__(
+        self, kind: ParticleKind, sprite: arcade.Sprite, rate: float, offset: tuple[float, float] = (0, 0)
+    ) -> None:
+        self.kind = kind
+        self.sprite = sprite
+        self.rate = rate
+        self.offset = offset
+        self._carry = 0.0
+
+    def due(self, delta_time: float) -> int:
+        """Returns how many particles to spawn for a frame, keeping the fraction for the next one."""
+        self._carry += self.rate * delta_time
+        count = int(self._carry)
+        self._carry -= count
+        return count
+
+
+class ParticleSystem:
+    """
+    Owns a pool, a GPU buffer and a geometry per particle kind.
+    Every kind is uploaded once per frame and drawn as points in one call, kinds with a glow are drawn a second
+    time into the light buffer when hooked with ``light_layer.light_sources.append(particles.draw_lights)``.
+    :param seed: Seed of the spawn randomness.
+    """
+
+    def __init__(self, seed: t.Optional[int] = None) -> None:
+        self.ctx = arcade.get_window().ctx
+        self.program = self.ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.rng = np.random.default_rng(seed)
+        self.emitters: list[ParticleEmitter] = []
+        self._pools: dict[ParticleKind, ParticlePool] = {}
+        self._geometry: dict[ParticleKind, tuple[arcade.gl.Buffer, arcade.gl.Geometry]] = {}
+
+    def __len__(self) -> int:
+        return sum(pool.count for pool in self._pools.values())
+
+    def pool(self, kind: ParticleKind) -> ParticlePool:
+        pool = self._pools.get(kind)
+        if pool is None:
+            pool = self._pools[kind] = ParticlePool(kind, self.rng)
+            buffer = self.ctx.buffer(reserve=kind.capacity * VERTEX.itemsize)
+            description = arcade.gl.BufferDescription(
+                buffer, "2f 4f1 1f", ["in_position", "in_color", "in_size"], normalized=["in_color"]
+            )
+            self._geometry[kind] = buffer, self.ctx.geometry([description], mode=self.ctx.POINTS)
+        return pool
+
+    def emit(self, kind: ParticleKind, x: float, y: float, count: int) -> int:
+        """Spawns a burst of particles, returns how many fit in the pool."""
+        return self.pool(kind).emit(x, y, count)
+
+    def attach(
+        self, kind: ParticleKind, sprite: arcade.Sprite, rate: float, offset: tuple[float, float] = (0, 0)
+    ) -> ParticleEmitter:
+        emitter = ParticleEmitter(kind, sprite, rate, offset)
+        self.emitters.append(emitter)
+        return emitter
+
+    def detach(self, emitter: ParticleEmitter) -> None:
+        self.emitters.remove(emitter)
+
+    def update(self, delta_time: float) -> None:
+        for emitter in self.emitters:
+            count = emitter.due(delta_time)
+            if count:
+                self.emit(
+                    emitter.kind,
+                    emitter.sprite.center_x + emitter.offset[0],
+                    emitter.sprite.center_y + emitter.offset[1],
+                    count,
+                )
+        for pool in self._pools.values():
+            pool.update(delta_time)
+
+    def _render(self, kinds: t.Iterable[ParticleKind], size_scale: float, glow: bool) -> None:
+        ctx = self.ctx
+        ctx.enable(ctx.PROGRAM_POINT_SIZE, ctx.BLEND)
+        self.program["size_scale"] = size_scale
+        for kind in kinds:
+            pool = self._pools[kind]
+            if not pool.count:
+                continue
+            buffer, geometry = self._geometry[kind]
+            if not glow:
+                buffer.write(pool.vertices[: pool.count].data)
+            self.program["intensity"] = kind.glow if glow else 1.0
+            geometry.render(self.program, vertices=pool.count)
+        ctx.disable(ctx.PROGRAM_POINT_SIZE)
+
+    def draw(self) -> None:
+        """Uploads and draws every kind, one call each."""
+        self._render(tuple(self._pools), 1.0, glow=False)
+
+    def draw_lights(self, scale: float) -> None:
+        """
+        Draws the glowing kinds into the light buffer, reusing the data uploaded by :meth:`draw` this frame.
+        :param scale: Resolution of the light buffer relative to the screen.
+        """
+        self._render((kind for kind in self._pools if kind.glow), scale, glow=True)
@@ -0,0 +1,95 @@
+import typing as t
+
+import arcade
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Tiles
+from src.world.chunks import ChunkedMap, ChunkKey
+
+__all__: tuple[str, ...] = ("ChunkStreamer",)
+
+WallList = arcade.SpriteList[arcade.Sprite]
+
+
+class ChunkStreamer:
+    """
+    Keeps only the chunks around the camera loaded, each in its own sprite list of the scene.
+    Loading or unloading a chunk only touches that chunk's list, however many walls are loaded.
+    :param world: Map the chunks are read from.
+    :param scene: Scene the sprite lists of loaded chunks are added to.
+    :param sprite_list: Creates an empty sprite list for a chunk.
+    :param before: Name of the scene sprite list the walls are drawn under, if any.
+    :param margin: Extra ring of chunks kept loaded around the visible area.
+    """
+
+    def __init__(
+        self,
+        world: ChunkedMap,
+        scene: arcade.Scene,
+        sprite_list: t.Callable[[], WallList],
+        before: t.Optional[str] = None,
+        margin: int = GameConfig.CHUNK_LOAD_MARGIN,
+    ) -> None:
+        self.world = world
+        self.scene = scene
+        self.sprite_list = sprite_list
+        self.before = before
+        self.margin = margin
+        self.loaded: dict[ChunkKey, tuple[int, WallList]] = {}
+        self._pool: list[arcade.Sprite] = []
+        self._lists: list[WallList] = []
+
+    def update(self, left: float, bottom: float, width: float, height: float) -> None:
+        """
+        Loads the chunks overlapping the given rectangle and drops the ones that left it.
+        :param left: Left edge of the visible area.
+        :param bottom: Bottom edge of the visible area.
+        :param width: Width of the visible area.
+        :param height: Height of the visible area.
+        """
+        world = self.world
+        wanted = world.chunks_in_rect(left, bottom, width, height, self.margin)
+        for key in self.loaded.keys() - wanted:
+            self.unload(key)
+        for key in wanted:
+            loaded = self.loaded.get(key)
+            if loaded is None:
+                self.load(key)
+            elif loaded[0] != world.chunk(*key).version:
+                self.unload(key)
+                self.load(key)
+
+    @staticmethod
+    def _name(key: ChunkKey) -> str:
+        return f"Walls {key[0]},{key[1]}"
+
+    def load(self, key: ChunkKey) -> None:
+        chunk = self.world.chunk(*key)
+        walls = self._lists.pop() if self._lists else self.sprite_list()
+        walls.extend(self._acquire(*self.world.tile_center(x, y)) for x, y in chunk.iter_tiles(Tiles.WALL))
+        scene = self.scene
+        if self.before is not None and self.before in scene.name_mapping:
+            scene.add_sprite_list_before(self._name(key), self.before, sprite_list=walls)
+        else:
+            scene.add_sprite_list(self._name(key), sprite_list=walls)
+        self.loaded[key] = (chunk.version, walls)
+
+    def unload(self, key: ChunkKey) -> None:
+        _, walls = self.loaded.pop(key)
+        self.scene.remove_sprite_list_by_name(self._name(key))
+        self._pool.extend(walls)
+        # the list and its sprites are reused by the next chunks loaded
+        walls.clear()
+        self._lists.append(walls)
+
+    def clear(self) -> None:
+        for key in tuple(self.loaded):
+            self.unload(key)
+
+    def _acquire(self, x: float, y: float) -> arcade.Sprite:
+        if self._pool:
+            sprite = self._pool.pop()
+            sprite.position = x, y
+            return sprite
+        size = self.world.tile_size
+        return arcade.SpriteSolidColor(size, size, center_x=x, center_y=y, color=arcade.color.DARK_SLATE_GRAY)
@@ -0,0 +1,25 @@
+import functools
+import types
+import typing as t
+
+import arcade.gui
+
+from src.utils.models import Style
+
+__all__: tuple[str, ...] = ("button_style",)
+
+PRESSED_FIELDS: t.Final[dict[str, str]] = {"bg_color_pressed": "bg", "border_color_pressed": "border"}
+
+
+@functools.cache
+def button_style(style: Style) -> t.Mapping[str, arcade.gui.UIFlatButton.UIStyle]:
+    """
+    Returns the flat button state styles for a style, built once and shared by every button using it.
+    :param style: Style to convert, usually one of the :class:`Styles` members.
+    """
+    options = {key: value for key, value in style.to_dict().items() if value is not None}
+    pressed = {PRESSED_FIELDS[key]: options.pop(key) for key in tuple(options) if key in PRESSED_FIELDS}
+    normal = arcade.gui.UIFlatButton.UIStyle(**options)
+    default = arcade.gui.UIFlatButton.UIStyle()
+    press = arcade.gui.UIFlatButton.UIStyle(**(options | pressed)) if pressed else default
+    return types.MappingProxyType({"normal": normal, "press": press, "hover": default, "disabled": default})
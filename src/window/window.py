@@ -1,5 +1,16 @@
+import pathlib
+import typing as t
+
 import arcade
 
+from src.utils.constants import GameConfig
+from src.utils.profiler import FrameProfiler, StartupTimer
+from src.window.assets import AssetManager
+from src.window.audio import AudioEngine
+
+if t.TYPE_CHECKING:
+    from src.world.inputs import InputBus, InputRecording
+
 
 class Window(arcade.Window):
     """Main application class."""
@@ -9,4 +20,33 @@ class Window(arcade.Window):
         self.mouse_x = 0
         self.mouse_y = 0
         self.mouse_left_is_pressed = False
-        arcade.set_background_color(arcade.color.ANTI_FLASH_WHITE)
\ No newline at end of file
+        self.assets = AssetManager()
+        self.audio = AudioEngine()
+        self.profiler = FrameProfiler()
+        self.record_path: t.Optional[pathlib.Path] = None
+        self.replay: t.Optional["InputRecording"] = None
+        self.input_bus: t.Optional["InputBus"] = None
+        self.startup: t.Optional[StartupTimer] = None
+        arcade.set_background_color(arcade.color.ANTI_FLASH_WHITE)
+
+    def flip(self) -> None:
+        super().flip()
+        startup = self.startup
+        if startup is not None:
+            # startup profiling stops at the first presented frame
+            self.startup = None
+            startup.mark("first_frame")
+            print(startup.report())
+            startup.export(GameConfig.STARTUP_TRACE_FILE)
+            self.close()
+            arcade.exit()
+
+    def close(self) -> None:
+        """Hides the current view, writes the frame trace and the input recording if any, then closes the window."""
+        self.hide_view()
+        self.audio.stop_all()
+        if self.profiler.has_samples():
+            self.profiler.export(GameConfig.PROFILER_TRACE_FILE)
+        if self.record_path is not None and self.input_bus is not None and self.input_bus.recording is not None:
+            self.input_bus.recording.save(self.record_path)
+        super().close()
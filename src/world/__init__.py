@@ -0,0 +1,42 @@
+from .chunks import Chunk, ChunkedMap, ChunkKey, GridLayout, border_layout
+from .entities import EntityStore
+from .generation import generate_map, load_or_generate
+from .headless import HeadlessRunner, InputScript, TickStats
+from .inputs import InputBus, InputEvent, InputRecording, apply_event
+from .navigation import NavigationGrid, PathRequest, PathService
+from .saves import SaveWriter, last_sequence, load_latest, load_snapshot
+from .simulation import Body, Simulation
+from .spatial import SpatialIndex
+from .workers import PathJob, WorkerJob, WorkerPool, WorldSnapshot
+
+__all__: tuple[str, ...] = (
+    "Body",
+    "Chunk",
+    "ChunkedMap",
+    "ChunkKey",
+    "EntityStore",
+    "GridLayout",
+    "HeadlessRunner",
+    "InputBus",
+    "InputEvent",
+    "InputRecording",
+    "InputScript",
+    "NavigationGrid",
+    "PathJob",
+    "PathRequest",
+    "PathService",
+    "SaveWriter",
+    "Simulation",
+    "SpatialIndex",
+    "TickStats",
+    "WorkerJob",
+    "WorkerPool",
+    "WorldSnapshot",
+    "apply_event",
+    "border_layout",
+    "generate_map",
+    "last_sequence",
+    "load_latest",
+    "load_or_generate",
+    "load_snapshot",
+)
@@ -0,0 +1,196 @@
+import typing as t
+
+import attrs
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Tiles
+
+__all__: tuple[str, ...] = (
+    "Chunk",
+    "ChunkedMap",
+    "ChunkKey",
+    "GridLayout",
+    "border_layout",
+)
+
+ChunkKey = tuple[int, int]
+TileLayout = t.Callable[[int, int], int]
+
+
+def border_layout(width: int, height: int) -> TileLayout:
+    """
+    Default layout, an empty room surrounded by walls.
+    :param width: Width of the map in tiles.
+    :param height: Height of the map in tiles.
+    """
+    wall, empty = Tiles.WALL, Tiles.EMPTY
+
+    def layout(x: int, y: int) -> int:
+        if x in (0, width - 1) or y in (0, height - 1):
+            return wall
+        return empty
+
+    return layout
+
+
+class GridLayout:
+    """
+    Layout reading tiles from a row-major buffer, such as a generated or memory-mapped map.
+    :param tiles: ``width * height`` tile ids, row by row from the bottom.
+    :param width: Width of the map in tiles.
+    """
+
+    __slots__ = ("tiles", "width")
+
+    def __init__(self, tiles: t.Union[bytes, bytearray, memoryview], width: int) -> None:
+        self.tiles = memoryview(tiles).cast("B")
+        self.width = width
+
+    def __call__(self, x: int, y: int) -> int:
+        return self.tiles[y * self.width + x]
+
+    def row(self, x: int, y: int, length: int) -> memoryview:
+        start = y * self.width + x
+        return self.tiles[start : start + length]
+
+
+@attrs.define(slots=True)
+class Chunk:
+    """
+    A square block of tiles stored row by row in a bytearray.
+    :param x: Chunk column.
+    :param y: Chunk row.
+    :param size: Width and height of the chunk in tiles.
+    :param tiles: Tile ids, ``size * size`` bytes.
+    """
+
+    x: int
+    y: int
+    size: int
+    tiles: bytearray
+    version: int = 0
+
+    @property
+    def key(self) -> ChunkKey:
+        return self.x, self.y
+
+    def get(self, local_x: int, local_y: int) -> int:
+        return self.tiles[local_y * self.size + local_x]
+
+    def set(self, local_x: int, local_y: int, tile: int) -> None:
+        self.tiles[local_y * self.size + local_x] = tile
+        self.version += 1
+
+    def iter_tiles(self, tile: int) -> t.Iterator[tuple[int, int]]:
+        """Yields the world tile coordinates of every tile of the given kind in the chunk."""
+        base_x, base_y = self.x * self.size, self.y * self.size
+        index = self.tiles.find(tile)
+        while index != -1:
+            local_y, local_x = divmod(index, self.size)
+            yield base_x + local_x, base_y + local_y
+            index = self.tiles.find(tile, index + 1)
+
+
+class ChunkedMap:
+    """
+    Tile map split into fixed size chunks which are only built when first requested.
+    :param width: Width of the map in tiles.
+    :param height: Height of the map in tiles.
+    :param layout: Callable returning the tile id for a world tile coordinate.
+    :param chunk_size: Width and height of a chunk in tiles.
+    :param tile_size: Width and height of a tile in pixels.
+    :param seed: Seed the layout was generated from, if any.
+    """
+
+    def __init__(
+        self,
+        width: int = GameConfig.MAP_SIZE_X,
+        height: int = GameConfig.MAP_SIZE_Y,
+        layout: t.Optional[TileLayout] = None,
+        chunk_size: int = GameConfig.CHUNK_SIZE,
+        tile_size: int = GameConfig.TILE_SIZE,
+        seed: t.Optional[int] = None,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.tile_size = tile_size
+        self.seed = seed
+        self.layout = layout or border_layout(width, height)
+        self.chunks_x = -(-width // chunk_size)
+        self.chunks_y = -(-height // chunk_size)
+        self._chunks: dict[ChunkKey, Chunk] = {}
+        self.version: int = 0
+
+    @property
+    def pixel_width(self) -> int:
+        return self.width * self.tile_size
+
+    @property
+    def pixel_height(self) -> int:
+        return self.height * self.tile_size
+
+    def chunk(self, x: int, y: int) -> Chunk:
+        """Returns the chunk at the given chunk coordinates, building it on first access."""
+        chunk = self._chunks.get((x, y))
+        if chunk is None:
+            chunk = self._build_chunk(x, y)
+            self._chunks[(x, y)] = chunk
+        return chunk
+
+    def rebuild(self, x: int, y: int) -> None:
+        """Resets a built chunk to the tiles of the layout."""
+        chunk = self.chunk(x, y)
+        chunk.tiles[:] = self._build_chunk(x, y).tiles
+        chunk.version += 1
+        self.version += 1
+
+    def iter_chunks(self) -> t.Iterator[Chunk]:
+        """Yields the chunks built so far."""
+        yield from self._chunks.values()
+
+    def _build_chunk(self, x: int, y: int) -> Chunk:
+        size = self.chunk_size
+        tiles = bytearray(size * size)
+        base_x, base_y = x * size, y * size
+        columns = min(size, self.width - base_x)
+        layout = self.layout
+        for local_y in range(min(size, self.height - base_y)):
+            row = local_y * size
+            if isinstance(layout, GridLayout):
+                tiles[row : row + columns] = layout.row(base_x, base_y + local_y, columns)
+                continue
+            for local_x in range(columns):
+                tiles[row + local_x] = layout(base_x + local_x, base_y + local_y)
+        return Chunk(x, y, size, tiles)
+
+    def get_tile(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return Tiles.EMPTY
+        size = self.chunk_size
+        return self.chunk(x // size, y // size).get(x % size, y % size)
+
+    def set_tile(self, x: int, y: int, tile: int) -> None:
+        size = self.chunk_size
+        self.chunk(x // size, y // size).set(x % size, y % size, tile)
+        self.version += 1
+
+    def tile_center(self, x: int, y: int) -> tuple[float, float]:
+        """Returns the pixel position of the center of a tile."""
+        return (x + 0.5) * self.tile_size, (y + 0.5) * self.tile_size
+
+    def chunks_in_rect(self, left: float, bottom: float, width: float, height: float, margin: int = 0) -> set[ChunkKey]:
+        """
+        Returns the keys of all chunks overlapping a rectangle in pixel space.
+        :param left: Left edge of the rectangle.
+        :param bottom: Bottom edge of the rectangle.
+        :param width: Width of the rectangle.
+        :param height: Height of the rectangle.
+        :param margin: Extra ring of chunks to include around the rectangle.
+        """
+        chunk_pixels = self.chunk_size * self.tile_size
+        min_x = max(int(left // chunk_pixels) - margin, 0)
+        min_y = max(int(bottom // chunk_pixels) - margin, 0)
+        max_x = min(int((left + width) // chunk_pixels) + margin, self.chunks_x - 1)
+        max_y = min(int((bottom + height) // chunk_pixels) + margin, self.chunks_y - 1)
+        return {(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)}
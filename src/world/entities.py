@@ -0,0 +1,140 @@
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from src.utils.enums import Tiles
+from src.world.chunks import ChunkedMap, ChunkKey, GridLayout
+
+__all__: tuple[str, ...] = ("EntityStore",)
+
+FloatArray = npt.NDArray[np.float32]
+
+
+class EntityStore:
+    """
+    Moving entities kept in contiguous arrays and advanced in bulk every tick.
+    Entities bounce off walls and the map edges, and must not be larger than a tile.
+    Removal swaps the last entity into the freed index, so indices are only stable until the next :meth:`despawn`.
+    :param world: Map the entities collide against.
+    :param capacity: Initial number of entities storage is allocated for.
+    """
+
+    def __init__(self, world: ChunkedMap, capacity: int = 256) -> None:
+        self.world = world
+        self.count = 0
+        # bumped whenever positions or the set of entities change, lets indexes know they are stale
+        self.version = 0
+        self.position: FloatArray = np.zeros((capacity, 2), np.float32)
+        self.previous: FloatArray = np.zeros((capacity, 2), np.float32)
+        self.velocity: FloatArray = np.zeros((capacity, 2), np.float32)
+        self.half_size: FloatArray = np.zeros((capacity, 2), np.float32)
+        self._walls: npt.NDArray[np.bool_] = np.zeros((0, 0), np.bool_)
+        self._walls_version = -1
+        # chunk versions the wall grid was copied from
+        self._chunk_versions: dict[ChunkKey, int] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def spawn(self, x: float, y: float, change_x: float, change_y: float, width: float, height: float) -> int:
+        """Adds an entity and returns its index."""
+        if self.count == len(self.position):
+            self.reserve(len(self.position) * 2)
+        index = self.count
+        self.position[index] = self.previous[index] = x, y
+        self.velocity[index] = change_x, change_y
+        self.half_size[index] = width / 2, height / 2
+        self.count += 1
+        self.version += 1
+        return index
+
+    def despawn(self, index: int) -> None:
+        last = self.count - 1
+        for array in (self.position, self.previous, self.velocity, self.half_size):
+            array[index] = array[last]
+        self.count = last
+        self.version += 1
+
+    def clear(self) -> None:
+        self.count = 0
+        self.version += 1
+
+    def reserve(self, capacity: int) -> None:
+        """Grows the arrays so they hold at least ``capacity`` entities."""
+        size = max(capacity, 1)
+        if size <= len(self.position):
+            return
+        for name in ("position", "previous", "velocity", "half_size"):
+            array: FloatArray = getattr(self, name)
+            grown = np.zeros((size, 2), np.float32)
+            grown[: self.count] = array[: self.count]
+            setattr(self, name, grown)
+
+    def interpolate(self, alpha: float) -> FloatArray:
+        """Returns the positions between the previous tick and the current one."""
+        count = self.count
+        previous = self.previous[:count]
+        return (previous + (self.position[:count] - previous) * alpha).astype(np.float32, copy=False)
+
+    def update(self) -> None:
+        """Moves every entity by its velocity and resolves wall hits, one axis at a time."""
+        count = self.count
+        if not count:
+            return
+        walls = self._wall_mask()
+        self.previous[:count] = self.position[:count]
+        for axis in (0, 1):
+            self.position[:count, axis] += self.velocity[:count, axis]
+            hit = self._hits(walls, count)
+            self.position[:count, axis][hit] = self.previous[:count, axis][hit]
+            self.velocity[:count, axis][hit] *= -1
+        self.version += 1
+
+    def _hits(self, walls: npt.NDArray[np.bool_], count: int) -> npt.NDArray[np.bool_]:
+        tile_size = self.world.tile_size
+        position, half = self.position[:count], self.half_size[:count]
+        low = np.floor((position - half) / tile_size).astype(np.intp)
+        high = np.floor((position + half - 1e-3) / tile_size).astype(np.intp)
+        height, width = walls.shape
+        outside = (low[:, 0] < 0) | (low[:, 1] < 0) | (high[:, 0] >= width) | (high[:, 1] >= height)
+        np.clip(low, 0, (width - 1, height - 1), out=low)
+        np.clip(high, 0, (width - 1, height - 1), out=high)
+        return (
+            outside
+            | walls[low[:, 1], low[:, 0]]
+            | walls[low[:, 1], high[:, 0]]
+            | walls[high[:, 1], low[:, 0]]
+            | walls[high[:, 1], high[:, 0]]
+        )
+
+    def _wall_mask(self) -> npt.NDArray[np.bool_]:
+        """Dense ``[y, x]`` wall grid of the map, only the chunks edited since the last call are copied again."""
+        world = self.world
+        if self._walls_version == world.version:
+            return self._walls
+        if self._walls_version == -1:
+            self._walls = np.zeros((world.height, world.width), np.bool_)
+            if isinstance(world.layout, GridLayout):
+                # unedited chunks match the layout, so they don't need to be built
+                grid = np.frombuffer(world.layout.tiles, np.uint8, world.width * world.height)
+                self._walls[:] = grid.reshape(world.height, world.width) == Tiles.WALL
+            else:
+                for chunk_x in range(world.chunks_x):
+                    for chunk_y in range(world.chunks_y):
+                        world.chunk(chunk_x, chunk_y)
+        size, versions = world.chunk_size, self._chunk_versions
+        for chunk in world.iter_chunks():
+            if versions.get(chunk.key, 0 if isinstance(world.layout, GridLayout) else -1) == chunk.version:
+                continue
+            versions[chunk.key] = chunk.version
+            base_x, base_y = chunk.x * size, chunk.y * size
+            rows, columns = min(size, world.height - base_y), min(size, world.width - base_x)
+            tiles = np.frombuffer(chunk.tiles, np.uint8).reshape(size, size)[:rows, :columns]
+            self._walls[base_y : base_y + rows, base_x : base_x + columns] = tiles == Tiles.WALL
+        self._walls_version = world.version
+        return self._walls
+
+    def positions(self) -> t.Iterator[tuple[float, float]]:
+        for x, y in self.position[: self.count].tolist():
+            yield x, y
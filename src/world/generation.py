@@ -0,0 +1,157 @@
+import concurrent.futures
+import multiprocessing
+import os
+import pathlib
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Paths, Tiles
+from src.world.chunks import ChunkedMap, GridLayout
+
+__all__: tuple[str, ...] = (
+    "cache_path",
+    "generate_grid",
+    "generate_map",
+    "load_or_generate",
+)
+
+TileGrid = npt.NDArray[np.uint8]
+
+# bump whenever the output for a given seed changes, so stale cache files are ignored
+GENERATOR_VERSION: t.Final[int] = 1
+NOISE_SCALE: t.Final[float] = 16.0
+NOISE_OCTAVES: t.Final[int] = 3
+WALL_THRESHOLD: t.Final[float] = 0.6
+SPAWN_CLEARANCE: t.Final[int] = 3
+
+_MASK = (1 << 64) - 1
+
+
+def _lattice(seed: int, ix: npt.NDArray[np.int64], iy: npt.NDArray[np.int64]) -> npt.NDArray[np.float32]:
+    """Hashes lattice points to values in ``[0, 1)``, independent of which band asks for them."""
+    with np.errstate(over="ignore"):
+        h = (ix.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) ^ (
+            iy.astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+        )
+        h ^= np.uint64(seed * 0x165667B19E3779F9 & _MASK)
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return (h >> np.uint64(40)).astype(np.float32) / np.float32(1 << 24)
+
+
+def _value_noise(seed: int, xs: npt.NDArray[np.float64], ys: npt.NDArray[np.float64]) -> npt.NDArray[np.float32]:
+    x0, y0 = np.floor(xs).astype(np.int64), np.floor(ys).astype(np.int64)
+    tx, ty = xs - x0, ys - y0
+    tx, ty = (tx * tx * (3 - 2 * tx)).astype(np.float32), (ty * ty * (3 - 2 * ty)).astype(np.float32)
+    # lattice rows and columns covering the band, then bilinear interpolation by indexing into them
+    columns = np.arange(x0[0], x0[-1] + 2, dtype=np.int64)
+    rows = np.arange(y0[0], y0[-1] + 2, dtype=np.int64)
+    values = _lattice(seed, columns[np.newaxis, :], rows[:, np.newaxis])
+    cx, cy = x0 - columns[0], (y0 - rows[0])[:, np.newaxis]
+    bottom = values[cy, cx] + (values[cy, cx + 1] - values[cy, cx]) * tx
+    top = values[cy + 1, cx] + (values[cy + 1, cx + 1] - values[cy + 1, cx]) * tx
+    return (bottom + (top - bottom) * ty[:, np.newaxis]).astype(np.float32, copy=False)
+
+
+def _generate_band(seed: int, width: int, height: int, start: int, stop: int) -> TileGrid:
+    """Generates rows ``start`` to ``stop`` of a map, every row only depends on the seed and its own index."""
+    xs, ys = np.arange(width, dtype=np.float64), np.arange(start, stop, dtype=np.float64)
+    noise = np.zeros((stop - start, width), np.float32)
+    amplitude, total = 1.0, 0.0
+    for octave in range(NOISE_OCTAVES):
+        frequency = 2**octave / NOISE_SCALE
+        noise += amplitude * _value_noise(seed + octave, xs * frequency, ys * frequency)
+        total += amplitude
+        amplitude /= 2
+    wall, empty = np.uint8(Tiles.WALL), np.uint8(Tiles.EMPTY)
+    band = np.where(noise / total > WALL_THRESHOLD, wall, empty)
+    band[:, [0, -1]] = wall
+    if start == 0:
+        band[0] = wall
+    if stop == height:
+        band[-1] = wall
+    center_x, center_y = width // 2, height // 2
+    low, high = max(center_y - SPAWN_CLEARANCE, start), min(center_y + SPAWN_CLEARANCE + 1, stop)
+    if low < high:
+        band[low - start : high - start, center_x - SPAWN_CLEARANCE : center_x + SPAWN_CLEARANCE + 1] = empty
+    return band
+
+
+def generate_grid(
+    seed: int,
+    width: int,
+    height: int,
+    workers: int = GameConfig.GENERATION_WORKERS,
+    parallel_tiles: int = GameConfig.GENERATION_PARALLEL_TILES,
+) -> TileGrid:
+    """
+    Generates a cave map from layered value noise, surrounded by walls and with an empty area at its center.
+    The result only depends on the seed and the size, large maps are generated in bands on a process pool.
+    :param seed: Seed of the noise.
+    :param width: Width of the map in tiles.
+    :param height: Height of the map in tiles.
+    :param workers: Number of processes used for large maps.
+    :param parallel_tiles: Size from which the process pool is used.
+    """
+    workers = min(workers, os.cpu_count() or 1)
+    if width * height < parallel_tiles or workers < 2:
+        return _generate_band(seed, width, height, 0, height)
+    bounds = np.linspace(0, height, workers + 1, dtype=int)
+    # forking would copy the window and its driver threads into every worker
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        bands = executor.map(
+            _generate_band,
+            *zip(*((seed, width, height, start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop)),
+        )
+        return np.concatenate(list(bands))
+
+
+def cache_path(seed: int, width: int, height: int, cache_dir: t.Optional[pathlib.Path] = None) -> pathlib.Path:
+    root = cache_dir or t.cast(pathlib.Path, Paths.CACHE)
+    return root / "maps" / f"v{GENERATOR_VERSION}-{seed}-{width}x{height}.npy"
+
+
+def load_or_generate(seed: int, width: int, height: int, cache_dir: t.Optional[pathlib.Path] = None) -> TileGrid:
+    """
+    Returns the generated map for a seed and size, memory-mapped from the cache when it was generated before.
+    :param seed: Seed of the map.
+    :param width: Width of the map in tiles.
+    :param height: Height of the map in tiles.
+    :param cache_dir: Folder of the cache, ``Paths.CACHE`` by default.
+    """
+    path = cache_path(seed, width, height, cache_dir)
+    if path.exists():
+        try:
+            grid = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+        else:
+            if grid.shape == (height, width) and grid.dtype == np.uint8:
+                return grid
+    grid = generate_grid(seed, width, height)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # written next to the target and renamed so a crash never leaves a truncated cache file
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with temporary.open("wb") as file:
+        np.save(file, grid)
+    os.replace(temporary, path)
+    return grid
+
+
+def generate_map(
+    seed: int = GameConfig.MAP_SEED,
+    width: int = GameConfig.MAP_SIZE_X,
+    height: int = GameConfig.MAP_SIZE_Y,
+    cache_dir: t.Optional[pathlib.Path] = None,
+) -> ChunkedMap:
+    """Builds a chunked map over the cached tiles of a generated map, chunks copy their rows on first access."""
+    grid = load_or_generate(seed, width, height, cache_dir)
+    layout = GridLayout(grid.data if grid.flags.c_contiguous else grid.tobytes(), width)
+    return ChunkedMap(width, height, layout, seed=seed)
@@ -0,0 +1,79 @@
+import time
+import typing as t
+
+import attrs
+
+from src.utils.constants import GameConfig
+from src.world.simulation import Simulation
+
+__all__: tuple[str, ...] = (
+    "HeadlessRunner",
+    "InputScript",
+    "TickStats",
+)
+
+InputScript = t.Mapping[int, t.Sequence[t.Callable[[Simulation], None]]]
+
+
+@attrs.define(frozen=True, slots=True)
+class TickStats:
+    """
+    Timings of a headless run.
+    :param durations: Wall time of every tick in seconds.
+    """
+
+    durations: tuple[float, ...]
+
+    @property
+    def ticks(self) -> int:
+        return len(self.durations)
+
+    @property
+    def ticks_per_second(self) -> float:
+        total = sum(self.durations)
+        return self.ticks / total if total else float("inf")
+
+    def percentile(self, percent: float) -> float:
+        """Returns the tick duration in seconds below which ``percent`` of the ticks fall."""
+        ordered = sorted(self.durations)
+        if not ordered:
+            return 0.0
+        return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "ticks": self.ticks,
+            "ticks_per_second": self.ticks_per_second,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+
+class HeadlessRunner:
+    """
+    Drives a :class:`Simulation` with a fixed timestep and scripted input, without a window or GL context.
+    :param simulation: Simulation to drive.
+    :param tick_rate: Ticks per simulated second, used as the fixed ``delta_time``.
+    :param script: Callables applied to the simulation before the tick they are keyed by.
+    """
+
+    def __init__(
+        self,
+        simulation: Simulation,
+        tick_rate: int = GameConfig.TICK_RATE,
+        script: t.Optional[InputScript] = None,
+    ) -> None:
+        self.simulation = simulation
+        self.delta_time = 1 / tick_rate
+        self.script: InputScript = script or {}
+
+    def run(self, ticks: int) -> TickStats:
+        durations: list[float] = []
+        simulation = self.simulation
+        for _ in range(ticks):
+            start = time.perf_counter()
+            for action in self.script.get(simulation.tic, ()):
+                action(simulation)
+            simulation.update(self.delta_time)
+            durations.append(time.perf_counter() - start)
+        return TickStats(tuple(durations))
@@ -0,0 +1,138 @@
+import pathlib
+import struct
+import typing as t
+
+import attrs
+
+from src.utils.enums import Inputs
+from src.world.chunks import ChunkedMap
+from src.world.generation import generate_map
+from src.world.headless import InputScript
+from src.world.simulation import Simulation
+
+__all__: tuple[str, ...] = (
+    "InputBus",
+    "InputEvent",
+    "InputRecording",
+    "apply_event",
+)
+
+MAGIC: t.Final[bytes] = b"PWIN"
+FORMAT_VERSION: t.Final[int] = 1
+
+# magic, format version, map seed (-1 if none), map width, map height, ticks, event count
+HEADER = struct.Struct("<4sHqIIII")
+EVENT = struct.Struct("<IBdd")
+
+
+@attrs.define(frozen=True, slots=True)
+class InputEvent:
+    """
+    Input turned into a simulation command, applied right before the tick it is stamped with.
+    :param tic: Tick the event is applied on.
+    :param kind: One of :class:`Inputs`.
+    """
+
+    tic: int
+    kind: int
+    x: float = 0
+    y: float = 0
+
+
+def apply_event(simulation: Simulation, event: InputEvent) -> None:
+    if event.kind == Inputs.CAMERA_VELOCITY_X:
+        simulation.set_camera_velocity(change_x=event.x)
+    elif event.kind == Inputs.CAMERA_VELOCITY_Y:
+        simulation.set_camera_velocity(change_y=event.y)
+    elif event.kind == Inputs.CAMERA_MOVE:
+        simulation.move_camera(event.x, event.y)
+
+
+@attrs.define(slots=True)
+class InputRecording:
+    """
+    Input of a session and the map it was played on, enough to replay it tick for tick.
+    :param seed: Seed of the generated map, ``None`` if it wasn't generated.
+    :param width: Width of the map in tiles.
+    :param height: Height of the map in tiles.
+    :param ticks: Number of ticks the session lasted.
+    """
+
+    seed: t.Optional[int]
+    width: int
+    height: int
+    ticks: int = 0
+    events: list[InputEvent] = attrs.field(factory=list[InputEvent])
+
+    def generate_map(self) -> ChunkedMap:
+        """Generates the map the session was played on again, raises ``ValueError`` if it had no seed."""
+        if self.seed is None:
+            raise ValueError("the recorded map wasn't generated from a seed, so it can't be rebuilt")
+        return generate_map(self.seed, self.width, self.height)
+
+    def to_script(self) -> InputScript:
+        """Returns the events as a script for :class:`HeadlessRunner`."""
+        script: dict[int, list[t.Callable[[Simulation], None]]] = {}
+        for event in self.events:
+            script.setdefault(event.tic, []).append(lambda simulation, event=event: apply_event(simulation, event))
+        return script
+
+    def save(self, path: t.Union[str, pathlib.Path]) -> None:
+        seed = -1 if self.seed is None else self.seed
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, seed, self.width, self.height, self.ticks, len(self.events))]
+        parts.extend(EVENT.pack(event.tic, event.kind, event.x, event.y) for event in self.events)
+        pathlib.Path(path).write_bytes(b"".join(parts))
+
+    @classmethod
+    def load(cls, path: t.Union[str, pathlib.Path]) -> "InputRecording":
+        data = pathlib.Path(path).read_bytes()
+        magic, version, seed, width, height, ticks, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} input recording")
+        end = HEADER.size + count * EVENT.size
+        events = [InputEvent(*fields) for fields in EVENT.iter_unpack(data[HEADER.size : end])]
+        return cls(None if seed == -1 else seed, width, height, ticks, events)
+
+
+class InputBus:
+    """
+    Queues input as :class:`InputEvent` and applies it at the next tick boundary, recording it if asked to.
+    While replaying, the recorded events are applied instead and pushed input is ignored.
+    :param simulation: Simulation the events are applied to.
+    :param record: Whether to keep every dispatched event in :attr:`recording`.
+    :param replay: Recording to play back.
+    """
+
+    def __init__(self, simulation: Simulation, record: bool = False, replay: t.Optional[InputRecording] = None) -> None:
+        self.simulation = simulation
+        self.replay = replay
+        self.recording: t.Optional[InputRecording] = None
+        if record:
+            world = simulation.world
+            self.recording = InputRecording(world.seed, world.width, world.height)
+        self._queue: list[tuple[int, float, float]] = []
+        self._script: InputScript = replay.to_script() if replay else {}
+
+    @property
+    def finished(self) -> bool:
+        """Whether a replay reached the end of its recording."""
+        return self.replay is not None and self.simulation.tic >= self.replay.ticks
+
+    def push(self, kind: int, x: float = 0, y: float = 0) -> None:
+        if self.replay is None:
+            self._queue.append((kind, x, y))
+
+    def dispatch(self) -> None:
+        """Applies the queued events, call right before every simulation tick."""
+        simulation = self.simulation
+        for action in self._script.get(simulation.tic, ()):
+            action(simulation)
+        recording = self.recording
+        for kind, x, y in self._queue:
+            event = InputEvent(simulation.tic, kind, x, y)
+            apply_event(simulation, event)
+            if recording is not None:
+                recording.events.append(event)
+        self._queue.clear()
+        if recording is not None:
+            recording.ticks = simulation.tic + 1
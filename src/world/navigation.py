@@ -0,0 +1,434 @@
+import collections
+import heapq
+import typing as t
+
+import attrs
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Tiles
+from src.world.chunks import ChunkedMap, ChunkKey
+
+__all__: tuple[str, ...] = (
+    "NavigationGrid",
+    "PathRequest",
+    "PathService",
+)
+
+Tile = tuple[int, int]
+Path = tuple[Tile, ...]
+
+# open runs along a chunk border at least this long get an entrance at both ends instead of one in the middle
+WIDE_ENTRANCE: t.Final[int] = 6
+# start and goal at most this many chunk widths apart are first searched tile by tile, skipping the entrances
+DIRECT_RANGE: t.Final[int] = 2
+
+_SIDES: tuple[tuple[int, int], ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_WALKABLE = bytes(0 if tile == Tiles.WALL else 1 for tile in range(256))
+
+
+class _Cluster:
+    """Abstract graph of one chunk, its entrance tiles and the walking distances between them."""
+
+    __slots__ = ("stamp", "checked", "base_x", "base_y", "columns", "rows", "walkable", "edges", "links")
+
+    def __init__(
+        self,
+        stamp: tuple[int, ...],
+        checked: int,
+        base_x: int,
+        base_y: int,
+        columns: int,
+        rows: int,
+        walkable: bytearray,
+    ) -> None:
+        # versions of the chunk and its four neighbours the graph was built from
+        self.stamp = stamp
+        self.checked = checked
+        self.base_x = base_x
+        self.base_y = base_y
+        self.columns = columns
+        self.rows = rows
+        self.walkable = walkable
+        self.edges: dict[Tile, list[tuple[Tile, int]]] = {}
+        self.links: dict[Tile, list[Tile]] = {}
+
+
+class NavigationGrid:
+    """
+    Hierarchical A* over the chunks of a map, walking between the four neighbours of a tile.
+    Every chunk is abstracted to the tiles where its border can be crossed and the distances between them,
+    built on first use and rebuilt when the chunk or one of its neighbours changed version.
+    Close tiles are searched directly across their chunks, further ones run over the entrances first and the
+    path is then searched again tile by tile within the chunks it crossed, so detours through entrances are cut.
+    :param world: Map whose walls block the paths.
+    """
+
+    def __init__(self, world: ChunkedMap) -> None:
+        self.world = world
+        self.size = world.chunk_size
+        # tiles and entrances visited by searches so far, the unit of work of :class:`PathService`
+        self.visited = 0
+        self._clusters: dict[ChunkKey, _Cluster] = {}
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        world = self.world
+        return 0 <= x < world.width and 0 <= y < world.height and world.get_tile(x, y) != Tiles.WALL
+
+    def chunk_of(self, tile: Tile) -> ChunkKey:
+        return tile[0] // self.size, tile[1] // self.size
+
+    def _version(self, x: int, y: int) -> int:
+        world = self.world
+        if 0 <= x < world.chunks_x and 0 <= y < world.chunks_y:
+            return world.chunk(x, y).version
+        return -1
+
+    def _cluster(self, key: ChunkKey) -> _Cluster:
+        world = self.world
+        cluster = self._clusters.get(key)
+        if cluster is not None and cluster.checked == world.version:
+            return cluster
+        x, y = key
+        stamp = (self._version(x, y), *(self._version(x + dx, y + dy) for dx, dy in _SIDES))
+        if cluster is not None and cluster.stamp == stamp:
+            cluster.checked = world.version
+            return cluster
+        size = self.size
+        base_x, base_y = x * size, y * size
+        cluster = _Cluster(
+            stamp,
+            world.version,
+            base_x,
+            base_y,
+            min(size, world.width - base_x),
+            min(size, world.height - base_y),
+            world.chunk(x, y).tiles.translate(_WALKABLE),
+        )
+        for dx, dy in _SIDES:
+            for inside, outside in self._entrances(key, dx, dy):
+                cluster.links.setdefault(inside, []).append(outside)
+        nodes = list(cluster.links)
+        for node in nodes:
+            distances, _ = self._flood(cluster, node)
+            cluster.edges[node] = [
+                (other, distances[index])
+                for other in nodes
+                if other != node and (index := self._index(cluster, other)) in distances
+            ]
+        self._clusters[key] = cluster
+        return cluster
+
+    def _entrances(self, key: ChunkKey, dx: int, dy: int) -> t.Iterator[tuple[Tile, Tile]]:
+        """Yields ``(inside, outside)`` tile pairs where a chunk can be left towards one of its sides."""
+        world, size = self.world, self.size
+        x, y = key
+        if not (0 <= x + dx < world.chunks_x and 0 <= y + dy < world.chunks_y):
+            return
+        # the border is walked in the same order from both chunks, so both agree on the entrances
+        if dx:
+            column = x * size + (size - 1 if dx > 0 else 0)
+            border = [((column, y * size + i), (column + dx, y * size + i)) for i in range(size)]
+        else:
+            row = y * size + (size - 1 if dy > 0 else 0)
+            border = [((x * size + i, row), (x * size + i, row + dy)) for i in range(size)]
+        is_walkable = self.is_walkable
+        run: list[tuple[Tile, Tile]] = []
+        for pair in (*border, None):
+            if pair is not None and is_walkable(*pair[0]) and is_walkable(*pair[1]):
+                run.append(pair)
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                yield run[0]
+                yield run[-1]
+            elif run:
+                yield run[len(run) // 2]
+            run = []
+
+    def _index(self, cluster: _Cluster, tile: Tile) -> int:
+        return (tile[1] - cluster.base_y) * self.size + tile[0] - cluster.base_x
+
+    def _flood(
+        self, cluster: _Cluster, start: Tile, target: t.Optional[Tile] = None
+    ) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        Breadth first search inside a chunk, returns the distances and parents of the local tile indices reached.
+        :param cluster: Chunk to search.
+        :param start: World tile the search starts from.
+        :param target: World tile to stop at, the whole reachable area is searched if omitted.
+        """
+        size, columns, rows, walkable = self.size, cluster.columns, cluster.rows, cluster.walkable
+        first = self._index(cluster, start)
+        last = -1 if target is None else self._index(cluster, target)
+        distances, parents = {first: 0}, {first: -1}
+        queue = collections.deque((first,))
+        while queue:
+            index = queue.popleft()
+            if index == last:
+                break
+            distance = distances[index] + 1
+            local_y, local_x = divmod(index, size)
+            for neighbour, inside in (
+                (index - 1, local_x > 0),
+                (index + 1, local_x < columns - 1),
+                (index - size, local_y > 0),
+                (index + size, local_y < rows - 1),
+            ):
+                if inside and walkable[neighbour] and neighbour not in distances:
+                    distances[neighbour] = distance
+                    parents[neighbour] = index
+                    queue.append(neighbour)
+        self.visited += len(distances)
+        return distances, parents
+
+    def _local_path(self, cluster: _Cluster, start: Tile, goal: Tile) -> t.Optional[list[Tile]]:
+        """Shortest path between two tiles of a chunk which doesn't leave it."""
+        _, parents = self._flood(cluster, start, goal)
+        index = self._index(cluster, goal)
+        if index not in parents:
+            return None
+        path: list[Tile] = []
+        size = self.size
+        while index != -1:
+            local_y, local_x = divmod(index, size)
+            path.append((cluster.base_x + local_x, cluster.base_y + local_y))
+            index = parents[index]
+        path.reverse()
+        return path
+
+    def _costs(self, cluster: _Cluster, tile: Tile) -> dict[Tile, int]:
+        """Distances from a tile to the entrances of its chunk it can reach."""
+        distances, _ = self._flood(cluster, tile)
+        return {node: distances[index] for node in cluster.links if (index := self._index(cluster, node)) in distances}
+
+    def find_path(self, start: Tile, goal: Tile) -> t.Optional[Path]:
+        """
+        Returns the tiles from ``start`` to ``goal`` both included, or ``None`` if the goal can't be reached.
+        :param start: Tile to walk from.
+        :param goal: Tile to walk to.
+        """
+        if not (self.is_walkable(*start) and self.is_walkable(*goal)):
+            return None
+        if start == goal:
+            return (start,)
+        size = self.size
+        if abs(start[0] - goal[0]) + abs(start[1] - goal[1]) <= DIRECT_RANGE * size:
+            # bounded to the area of the chunks around both tiles, the entrances are searched past it
+            direct, complete = self._search(start, goal, None, (DIRECT_RANGE * 2 + 1) ** 2 * size * size)
+            if direct is not None or complete:
+                return direct
+        start_key, goal_key = self.chunk_of(start), self.chunk_of(goal)
+        start_cluster = self._cluster(start_key)
+        goal_cluster = self._cluster(goal_key)
+        goal_costs = self._costs(goal_cluster, goal)
+        if not goal_costs:
+            return None
+        goal_x, goal_y = goal
+        costs: dict[Tile, int] = {}
+        parents: dict[Tile, t.Optional[Tile]] = {}
+        heap: list[tuple[int, int, Tile]] = []
+        for node, cost in self._costs(start_cluster, start).items():
+            costs[node], parents[node] = cost, None
+            heapq.heappush(heap, (cost + abs(node[0] - goal_x) + abs(node[1] - goal_y), cost, node))
+        best: t.Optional[int] = None
+        exit_node: t.Optional[Tile] = None
+        while heap:
+            estimate, cost, node = heapq.heappop(heap)
+            if best is not None and estimate >= best:
+                break
+            if cost > costs[node]:
+                continue
+            self.visited += 1
+            if node in goal_costs and (best is None or cost + goal_costs[node] < best):
+                best, exit_node = cost + goal_costs[node], node
+            cluster = self._cluster(self.chunk_of(node))
+            for other, step in (*cluster.edges[node], *((other, 1) for other in cluster.links[node])):
+                total = cost + step
+                if total < costs.get(other, total + 1):
+                    costs[other], parents[other] = total, node
+                    heapq.heappush(heap, (total + abs(other[0] - goal_x) + abs(other[1] - goal_y), total, other))
+        if exit_node is None:
+            return None
+        waypoints = [goal]
+        waypoint: t.Optional[Tile] = exit_node
+        while waypoint is not None:
+            waypoints.append(waypoint)
+            waypoint = parents[waypoint]
+        waypoints.append(start)
+        waypoints.reverse()
+        refined = self._refine(waypoints)
+        smoothed, _ = self._search(start, goal, {self.chunk_of(tile) for tile in refined})
+        return refined if smoothed is None or len(smoothed) >= len(refined) else smoothed
+
+    def _search(
+        self, start: Tile, goal: Tile, chunks: t.Optional[set[ChunkKey]] = None, limit: t.Optional[int] = None
+    ) -> tuple[t.Optional[Path], bool]:
+        """
+        A* over the tiles of the map, returns the path found and whether the search ran to its end.
+        :param start: Tile to walk from.
+        :param goal: Tile to walk to.
+        :param chunks: Chunks the path may cross, any if omitted.
+        :param limit: Tiles visited before the search gives up, unbounded if omitted.
+        """
+        world, size = self.world, self.size
+        width, height = world.width, world.height
+        goal_x, goal_y = goal
+        tiles: dict[ChunkKey, t.Optional[bytearray]] = {}
+        costs = {start: 0}
+        parents: dict[Tile, t.Optional[Tile]] = {start: None}
+        heap = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start)]
+        visited = 0
+        complete = True
+        while heap:
+            _, cost, tile = heapq.heappop(heap)
+            cost = -cost
+            if tile == goal:
+                break
+            if cost > costs[tile]:
+                continue
+            visited += 1
+            if limit is not None and visited > limit:
+                complete = False
+                break
+            x, y = tile
+            cost += 1
+            for side_x, side_y in _SIDES:
+                other_x, other_y = x + side_x, y + side_y
+                if not (0 <= other_x < width and 0 <= other_y < height):
+                    continue
+                key = other_x // size, other_y // size
+                if key not in tiles:
+                    tiles[key] = world.chunk(*key).tiles if chunks is None or key in chunks else None
+                chunk_tiles = tiles[key]
+                if chunk_tiles is None or not _WALKABLE[chunk_tiles[(other_y % size) * size + other_x % size]]:
+                    continue
+                other = other_x, other_y
+                if cost < costs.get(other, cost + 1):
+                    costs[other], parents[other] = cost, tile
+                    # deeper tiles first among equal estimates, they lie closer to the goal
+                    heapq.heappush(heap, (cost + abs(other_x - goal_x) + abs(other_y - goal_y), -cost, other))
+        self.visited += visited
+        if goal not in parents:
+            return None, complete
+        path: list[Tile] = []
+        node: t.Optional[Tile] = goal
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return tuple(path), True
+
+    def _refine(self, waypoints: list[Tile]) -> Path:
+        """Expands consecutive entrances into the tiles between them."""
+        path = [waypoints[0]]
+        for previous, current in zip(waypoints, waypoints[1:]):
+            if previous == current:
+                continue
+            key = self.chunk_of(previous)
+            if key != self.chunk_of(current):
+                path.append(current)
+                continue
+            local = self._local_path(self._cluster(key), previous, current)
+            assert local is not None, "entrances of a chunk are only linked when connected"
+            path.extend(local[1:])
+        return tuple(path)
+
+
+@attrs.define(slots=True, eq=False)
+class PathRequest:
+    """
+    A path search queued on a :class:`PathService`.
+    :param start: Tile to walk from.
+    :param goal: Tile to walk to.
+    :param path: Tiles of the path once searched, ``None`` if the goal is unreachable.
+    :param done: Whether the search ran.
+    :param attempts: Times a worker's search of it was thrown away because the map changed meanwhile.
+    """
+
+    start: Tile
+    goal: Tile
+    path: t.Optional[Path] = None
+    done: bool = False
+    attempts: int = 0
+
+
+class PathService:
+    """
+    Spreads path searches across ticks and caches their results until the map changes.
+    :param grid: Navigation grid the paths are searched on.
+    :param budget: Tiles and entrances searches may visit per :meth:`update`, at least one request always runs.
+    :param cache_size: Number of origin and target pairs whose path is kept.
+    """
+
+    def __init__(
+        self,
+        grid: NavigationGrid,
+        budget: int = GameConfig.PATHFINDING_BUDGET,
+        cache_size: int = GameConfig.PATH_CACHE_SIZE,
+    ) -> None:
+        self.grid = grid
+        self.budget = budget
+        self.cache_size = cache_size
+        self.pending: collections.deque[PathRequest] = collections.deque()
+        # set when the queue is searched on worker threads instead, see :class:`src.world.workers.PathJob`
+        self.offloaded = False
+        self._cache: collections.OrderedDict[tuple[Tile, Tile], t.Optional[Path]] = collections.OrderedDict()
+        self._cache_version = grid.world.version
+
+    def _cached(self, key: tuple[Tile, Tile]) -> tuple[bool, t.Optional[Path]]:
+        version = self.grid.world.version
+        if version != self._cache_version:
+            # walls may have opened shortcuts as well as blocked paths, so nothing cached survives an edit
+            self._cache.clear()
+            self._cache_version = version
+        if key not in self._cache:
+            return False, None
+        self._cache.move_to_end(key)
+        return True, self._cache[key]
+
+    def _store(self, key: tuple[Tile, Tile], path: t.Optional[Path]) -> None:
+        self._cache[key] = path
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def find(self, start: Tile, goal: Tile) -> t.Optional[Path]:
+        """Searches a path right away, see :meth:`NavigationGrid.find_path`."""
+        key = start, goal
+        hit, path = self._cached(key)
+        if not hit:
+            path = self.grid.find_path(start, goal)
+            self._store(key, path)
+        return path
+
+    def request(self, start: Tile, goal: Tile) -> PathRequest:
+        """Queues a path search, the request is completed immediately when its path is cached."""
+        request = PathRequest(start, goal)
+        hit, path = self._cached((start, goal))
+        if hit:
+            request.path, request.done = path, True
+        else:
+            self.pending.append(request)
+        return request
+
+    def complete(self, request: PathRequest, path: t.Optional[Path]) -> None:
+        """Fills in a request searched elsewhere and caches its path."""
+        self._cached((request.start, request.goal))
+        self._store((request.start, request.goal), path)
+        request.path, request.done = path, True
+
+    def take(self, count: int) -> list[PathRequest]:
+        """Removes up to ``count`` requests from the front of the queue."""
+        pending = self.pending
+        return [pending.popleft() for _ in range(min(count, len(pending)))]
+
+    def update(self) -> int:
+        """Runs queued searches until the budget is spent, returns how many requests were completed."""
+        if self.offloaded:
+            return 0
+        grid, pending = self.grid, self.pending
+        limit = grid.visited + self.budget
+        completed = 0
+        while pending and (not completed or grid.visited < limit):
+            request = pending.popleft()
+            self.complete(request, self.find(request.start, request.goal))
+            completed += 1
+        return completed
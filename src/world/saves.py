@@ -0,0 +1,255 @@
+import concurrent.futures
+import mmap
+import pathlib
+import struct
+import typing as t
+
+import numpy as np
+
+from src.utils.constants import GameConfig
+from src.world.simulation import Body, Simulation
+
+__all__: tuple[str, ...] = (
+    "SaveWriter",
+    "last_sequence",
+    "load_latest",
+    "load_snapshot",
+)
+
+MAGIC: t.Final[bytes] = b"PWSV"
+FORMAT_VERSION: t.Final[int] = 1
+FULL_SUFFIX: t.Final[str] = ".full"
+DELTA_SUFFIX: t.Final[str] = ".delta"
+
+# magic, format version, full flag, sequence, map seed (-1 if none), tic, map width, map height, chunk size
+HEADER = struct.Struct("<4sHBIqQIIH")
+COUNT = struct.Struct("<I")
+BODY = struct.Struct("<6d?")
+CHUNK = struct.Struct("<iiI")
+# entity count after the snapshot, number of entity rows in the snapshot
+ENTITIES = struct.Struct("<II")
+ENTITY_ROW = np.dtype([("index", "<u4"), ("position", "<f4", 2), ("velocity", "<f4", 2), ("half_size", "<f4", 2)])
+
+
+class SaveWriter:
+    """
+    Writes numbered snapshots of a simulation into a folder.
+    The first snapshot and every ``full_every`` after it contain the whole state, the others only hold
+    the chunks and entities which changed since the previous snapshot. Files are written on a worker thread.
+    Numbering continues after the snapshots already in the folder, so those of an earlier session are never
+    loaded over the new ones.
+    :param directory: Folder the snapshots are written to.
+    :param full_every: Number of delta snapshots between two full ones.
+    """
+
+    def __init__(self, directory: pathlib.Path, full_every: int = GameConfig.AUTOSAVE_FULL_EVERY) -> None:
+        self.directory = directory
+        self.full_every = full_every
+        self.sequence = last_sequence(directory)
+        self._deltas = 0
+        self._full_pending = True
+        self._chunk_versions: dict[tuple[int, int], int] = {}
+        self._entities: t.Optional[np.ndarray[t.Any, np.dtype[t.Any]]] = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="saves")
+        self._pending: t.Optional[concurrent.futures.Future[None]] = None
+
+    def reset(self) -> None:
+        """Makes the next snapshot a full one, call after the simulation was replaced or loaded."""
+        self._full_pending = True
+
+    def save(self, simulation: Simulation, full: bool = False) -> concurrent.futures.Future[None]:
+        """
+        Packs the simulation on the calling thread and writes it in the background.
+        :param simulation: Simulation to save.
+        :param full: Whether to write a full snapshot even if a delta is due.
+        """
+        full = full or self._full_pending or self._deltas >= self.full_every
+        if full:
+            self._chunk_versions.clear()
+            self._entities = None
+            self._deltas = 0
+        else:
+            self._deltas += 1
+        self.sequence += 1
+        self._full_pending = False
+        data = self._pack(simulation, full)
+        path = self.directory / f"{self.sequence:08d}{FULL_SUFFIX if full else DELTA_SUFFIX}"
+        if self._pending is not None:
+            self._pending.result()
+        self._pending = self._executor.submit(self._write, path, data, full)
+        return self._pending
+
+    def flush(self) -> None:
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def _pack(self, simulation: Simulation, full: bool) -> bytes:
+        world = simulation.world
+        seed = -1 if world.seed is None else world.seed
+        parts = [
+            HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                full,
+                self.sequence,
+                seed,
+                simulation.tic,
+                world.width,
+                world.height,
+                world.chunk_size,
+            ),
+            COUNT.pack(len(simulation.bodies)),
+        ]
+        parts.extend(
+            BODY.pack(body.x, body.y, body.width, body.height, body.change_x, body.change_y, body.bounce)
+            for body in simulation.bodies
+        )
+        # unchanged chunks are rebuilt from the map layout on load
+        changed = [
+            chunk
+            for chunk in world.iter_chunks()
+            if chunk.version and self._chunk_versions.get(chunk.key) != chunk.version
+        ]
+        parts.append(COUNT.pack(len(changed)))
+        for chunk in changed:
+            parts.append(CHUNK.pack(chunk.x, chunk.y, chunk.version))
+            parts.append(bytes(chunk.tiles))
+            self._chunk_versions[chunk.key] = chunk.version
+        parts.append(self._pack_entities(simulation))
+        return b"".join(parts)
+
+    def _pack_entities(self, simulation: Simulation) -> bytes:
+        store = simulation.entities
+        count = store.count
+        rows = np.empty(count, ENTITY_ROW)
+        rows["index"] = np.arange(count)
+        rows["position"] = store.position[:count]
+        rows["velocity"] = store.velocity[:count]
+        rows["half_size"] = store.half_size[:count]
+        previous = self._entities
+        if previous is None:
+            changed = rows
+        else:
+            shared = min(count, len(previous))
+            mask = np.ones(count, np.bool_)
+            old, new = previous[:shared], rows[:shared]
+            mask[:shared] = (
+                (old["position"] != new["position"]).any(axis=1)
+                | (old["velocity"] != new["velocity"]).any(axis=1)
+                | (old["half_size"] != new["half_size"]).any(axis=1)
+            )
+            changed = rows[mask]
+        self._entities = rows
+        return ENTITIES.pack(count, len(changed)) + changed.tobytes()
+
+    def _write(self, path: pathlib.Path, data: bytes, full: bool) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+        if full:
+            # everything before a full snapshot is superseded by it
+            for old in self.directory.iterdir():
+                if old.suffix in (FULL_SUFFIX, DELTA_SUFFIX) and old.stem < path.stem:
+                    old.unlink(missing_ok=True)
+
+
+def last_sequence(directory: pathlib.Path) -> int:
+    """Returns the highest sequence number of the snapshots in a folder, ``0`` if there is none."""
+    if not directory.is_dir():
+        return 0
+    return max(
+        (
+            int(path.stem)
+            for path in directory.iterdir()
+            if path.suffix in (FULL_SUFFIX, DELTA_SUFFIX) and path.stem.isdigit()
+        ),
+        default=0,
+    )
+
+
+def load_snapshot(path: pathlib.Path, simulation: Simulation) -> int:
+    """
+    Applies one snapshot on top of a simulation and returns its sequence number.
+    A full snapshot must be applied to a simulation whose map was built from the same seed and size.
+    :param path: Snapshot file.
+    :param simulation: Simulation to update.
+    """
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, version, full, sequence, seed, tic, width, height, chunk_size = HEADER.unpack_from(data)
+        world = simulation.world
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} save")
+        if (width, height, chunk_size) != (world.width, world.height, world.chunk_size):
+            raise ValueError(f"{path} was saved for a {width}x{height} map")
+        if seed != -1 and world.seed is not None and seed != world.seed:
+            raise ValueError(f"{path} was saved for the map of seed {seed}")
+        offset = HEADER.size
+        (bodies,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        loaded: list[Body] = []
+        for _ in range(bodies):
+            x, y, body_width, body_height, change_x, change_y, bounce = BODY.unpack_from(data, offset)
+            loaded.append(Body(x, y, body_width, body_height, change_x, change_y, bounce))
+            offset += BODY.size
+        simulation.camera, *others = loaded
+        simulation.bodies = [simulation.camera, *others]
+
+        (chunks,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        tiles_size = chunk_size * chunk_size
+        saved: set[tuple[int, int]] = set()
+        for _ in range(chunks):
+            chunk_x, chunk_y, _ = CHUNK.unpack_from(data, offset)
+            offset += CHUNK.size
+            saved.add((chunk_x, chunk_y))
+            chunk = world.chunk(chunk_x, chunk_y)
+            chunk.tiles[:] = data[offset : offset + tiles_size]
+            # bumped rather than restored, so views caching the old version rebuild the chunk
+            chunk.version += 1
+            offset += tiles_size
+        if chunks:
+            world.version += 1
+        if full:
+            # chunks edited since the save but unchanged in it go back to the layout
+            for chunk in list(world.iter_chunks()):
+                if chunk.version and chunk.key not in saved:
+                    world.rebuild(chunk.x, chunk.y)
+
+        count, changed = ENTITIES.unpack_from(data, offset)
+        offset += ENTITIES.size
+        rows = np.frombuffer(data, ENTITY_ROW, changed, offset)
+        store = simulation.entities
+        store.reserve(count)
+        if full:
+            store.clear()
+        store.count = count
+        indices = rows["index"].astype(np.intp)
+        store.position[indices] = rows["position"]
+        store.velocity[indices] = rows["velocity"]
+        store.half_size[indices] = rows["half_size"]
+        store.previous[:count] = store.position[:count]
+        store.version += 1
+        del rows
+        simulation.tic = tic
+        return sequence
+
+
+def load_latest(directory: pathlib.Path, simulation: Simulation) -> t.Optional[int]:
+    """
+    Applies the newest full snapshot of a folder and the deltas written after it.
+    Returns the sequence number of the last snapshot applied, or ``None`` if there is none.
+    :param directory: Folder written by a :class:`SaveWriter`.
+    :param simulation: Simulation to update.
+    """
+    if not directory.is_dir():
+        return None
+    snapshots = sorted(path for path in directory.iterdir() if path.suffix in (FULL_SUFFIX, DELTA_SUFFIX))
+    fulls = [index for index, path in enumerate(snapshots) if path.suffix == FULL_SUFFIX]
+    if not fulls:
+        return None
+    sequence = None
+    for path in snapshots[fulls[-1] :]:
+        sequence = load_snapshot(path, simulation)
+    return sequence
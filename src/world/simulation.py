@@ -0,0 +1,127 @@
+import math
+import typing as t
+
+import attrs
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Tiles
+from src.world.chunks import ChunkedMap
+from src.world.entities import EntityStore
+from src.world.navigation import NavigationGrid, PathService
+from src.world.spatial import SpatialIndex
+
+__all__: tuple[str, ...] = (
+    "Body",
+    "Simulation",
+)
+
+
+@attrs.define(slots=True)
+class Body:
+    """
+    Axis aligned moving box, the simulation side of a sprite.
+    :param x: Center x position in pixels.
+    :param y: Center y position in pixels.
+    :param width: Width in pixels.
+    :param height: Height in pixels.
+    :param bounce: Whether the velocity is reversed when hitting a wall instead of being stopped.
+    """
+
+    x: float
+    y: float
+    width: float = GameConfig.TILE_SIZE
+    height: float = GameConfig.TILE_SIZE
+    change_x: float = 0
+    change_y: float = 0
+    bounce: bool = False
+    previous_x: float = attrs.field(default=attrs.Factory(lambda self: self.x, takes_self=True))
+    previous_y: float = attrs.field(default=attrs.Factory(lambda self: self.y, takes_self=True))
+
+    @property
+    def position(self) -> tuple[float, float]:
+        return self.x, self.y
+
+    def interpolate(self, alpha: float) -> tuple[float, float]:
+        """
+        Returns the position between the previous tick and the current one.
+        :param alpha: Fraction of a tick elapsed since the current position was computed.
+        """
+        return (
+            self.previous_x + (self.x - self.previous_x) * alpha,
+            self.previous_y + (self.y - self.previous_y) * alpha,
+        )
+
+
+class Simulation:
+    """
+    Window independent game state, stepped once per tick by :class:`Game` or a headless runner.
+    :param world: Map the bodies collide against.
+    :param camera_size: Size of the body the camera follows.
+    """
+
+    def __init__(self, world: ChunkedMap, camera_size: tuple[float, float] = (38, 42)) -> None:
+        self.world = world
+        self.camera = Body(world.pixel_width / 2, world.pixel_height / 2, *camera_size)
+        self.bodies: list[Body] = [self.camera]
+        self.entities = EntityStore(world)
+        self.spatial = SpatialIndex(self.entities)
+        self.paths = PathService(NavigationGrid(world))
+        self.tic: int = 0
+
+    def spawn(self, body: Body) -> Body:
+        self.bodies.append(body)
+        return body
+
+    def set_camera_velocity(self, change_x: t.Optional[float] = None, change_y: t.Optional[float] = None) -> None:
+        if change_x is not None:
+            self.camera.change_x = change_x
+        if change_y is not None:
+            self.camera.change_y = change_y
+
+    def move_camera(self, dx: float, dy: float) -> None:
+        """Teleports the camera body, the move isn't interpolated."""
+        camera = self.camera
+        camera.x += dx
+        camera.y += dy
+        camera.previous_x, camera.previous_y = camera.x, camera.y
+
+    def update(self, delta_time: float) -> None:
+        """Advances the simulation by one fixed tick."""
+        for body in self.bodies:
+            body.previous_x, body.previous_y = body.x, body.y
+            if body.change_x or body.change_y:
+                self._move(body)
+        self.entities.update()
+        self.paths.update()
+        self.tic += 1
+
+    def _move(self, body: Body) -> None:
+        if body.change_x:
+            body.x += body.change_x
+            walls = self._walls_overlapping(body)
+            if walls:
+                tile_size = self.world.tile_size
+                if body.change_x > 0:
+                    body.x = min(x for x, _ in walls) * tile_size - body.width / 2
+                else:
+                    body.x = (max(x for x, _ in walls) + 1) * tile_size + body.width / 2
+                body.change_x = -body.change_x if body.bounce else 0
+        if body.change_y:
+            body.y += body.change_y
+            walls = self._walls_overlapping(body)
+            if walls:
+                tile_size = self.world.tile_size
+                if body.change_y > 0:
+                    body.y = min(y for _, y in walls) * tile_size - body.height / 2
+                else:
+                    body.y = (max(y for _, y in walls) + 1) * tile_size + body.height / 2
+                body.change_y = -body.change_y if body.bounce else 0
+
+    def _walls_overlapping(self, body: Body) -> list[tuple[int, int]]:
+        tile_size = self.world.tile_size
+        left = math.floor((body.x - body.width / 2) / tile_size)
+        right = math.ceil((body.x + body.width / 2) / tile_size)
+        bottom = math.floor((body.y - body.height / 2) / tile_size)
+        top = math.ceil((body.y + body.height / 2) / tile_size)
+        get_tile, wall = self.world.get_tile, Tiles.WALL
+        return [(x, y) for x in range(left, right) for y in range(bottom, top) if get_tile(x, y) == wall]
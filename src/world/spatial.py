@@ -0,0 +1,160 @@
+import math
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from src.utils.constants import GameConfig
+from src.utils.enums import Tiles
+from src.world.chunks import ChunkedMap
+from src.world.entities import EntityStore
+
+__all__: tuple[str, ...] = ("SpatialIndex",)
+
+Indices = npt.NDArray[np.intp]
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the entities of an :class:`EntityStore`, answering rectangle, nearest and raycast queries.
+    The grid is a counting sort of the entities by cell, rebuilt on the first query after the entities changed.
+    Entities are bucketed by their center, so they must not be larger than a cell.
+    :param entities: Entities to index.
+    :param cell_size: Width and height of a cell in pixels.
+    """
+
+    def __init__(self, entities: EntityStore, cell_size: int = GameConfig.SPATIAL_CELL_SIZE) -> None:
+        self.entities = entities
+        self.cell_size = cell_size
+        world = entities.world
+        self.columns = max(-(-world.pixel_width // cell_size), 1)
+        self.rows = max(-(-world.pixel_height // cell_size), 1)
+        self._order: Indices = np.zeros(0, np.intp)
+        self._starts: Indices = np.zeros(self.columns * self.rows + 1, np.intp)
+        self._version = -1
+
+    @property
+    def world(self) -> ChunkedMap:
+        return self.entities.world
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        column = min(max(int(x // self.cell_size), 0), self.columns - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return column, row
+
+    def _rebuild(self) -> None:
+        entities = self.entities
+        if self._version == entities.version:
+            return
+        position = entities.position[: entities.count]
+        cells = np.floor(position / self.cell_size).astype(np.intp)
+        np.clip(cells, 0, (self.columns - 1, self.rows - 1), out=cells)
+        ids = cells[:, 1] * self.columns + cells[:, 0]
+        self._order = np.argsort(ids, kind="stable")
+        self._starts[0] = 0
+        np.cumsum(np.bincount(ids, minlength=self.columns * self.rows), out=self._starts[1:])
+        self._version = entities.version
+
+    def _candidates(self, min_column: int, min_row: int, max_column: int, max_row: int) -> Indices:
+        # the cells of a row are contiguous in the sorted order, so each row is one slice
+        starts, order, columns = self._starts, self._order, self.columns
+        parts = [
+            order[starts[row * columns + min_column] : starts[row * columns + max_column + 1]]
+            for row in range(min_row, max_row + 1)
+        ]
+        return np.concatenate(parts) if parts else np.zeros(0, np.intp)
+
+    def query_rect(self, left: float, bottom: float, width: float, height: float) -> Indices:
+        """
+        Returns the indices of the entities overlapping a rectangle.
+        :param left: Left edge of the rectangle.
+        :param bottom: Bottom edge of the rectangle.
+        :param width: Width of the rectangle.
+        :param height: Height of the rectangle.
+        """
+        self._rebuild()
+        # neighbouring cells too, an entity may stick out of the cell its center is in
+        min_column, min_row = self._cell(left - self.cell_size, bottom - self.cell_size)
+        max_column, max_row = self._cell(left + width + self.cell_size, bottom + height + self.cell_size)
+        candidates = self._candidates(min_column, min_row, max_column, max_row)
+        position = self.entities.position[candidates]
+        half = self.entities.half_size[candidates]
+        inside = (
+            (position[:, 0] + half[:, 0] >= left)
+            & (position[:, 0] - half[:, 0] <= left + width)
+            & (position[:, 1] + half[:, 1] >= bottom)
+            & (position[:, 1] - half[:, 1] <= bottom + height)
+        )
+        return candidates[inside]
+
+    def query_point(self, x: float, y: float) -> Indices:
+        """Returns the indices of the entities covering a point, for picking."""
+        return self.query_rect(x, y, 0, 0)
+
+    def nearest(self, x: float, y: float, k: int = 1) -> Indices:
+        """
+        Returns the indices of the ``k`` entities whose centers are closest to a point, closest first.
+        :param x: X of the point.
+        :param y: Y of the point.
+        :param k: Number of entities to return, fewer if there aren't as many.
+        """
+        if k <= 0:
+            return np.zeros(0, np.intp)
+        self._rebuild()
+        column, row = self._cell(x, y)
+        radius = 0
+        while True:
+            candidates = self._candidates(
+                max(column - radius, 0),
+                max(row - radius, 0),
+                min(column + radius, self.columns - 1),
+                min(row + radius, self.rows - 1),
+            )
+            covers_grid = radius >= max(column, row, self.columns - 1 - column, self.rows - 1 - row)
+            if len(candidates) >= k or covers_grid:
+                offsets = self.entities.position[candidates] - (x, y)
+                distances = np.einsum("ij,ij->i", offsets, offsets)
+                closest = np.argsort(distances, kind="stable")[:k]
+                # anything outside the searched square is at least ``radius`` cells away
+                if covers_grid or distances[closest[-1]] <= (radius * self.cell_size) ** 2:
+                    return candidates[closest]
+            radius += 1
+
+    def raycast(self, start_x: float, start_y: float, end_x: float, end_y: float) -> t.Optional[tuple[int, int]]:
+        """
+        Walks the tiles crossed by a segment and returns the first wall tile hit, ``None`` if the line is clear.
+        :param start_x: X of the start of the segment.
+        :param start_y: Y of the start of the segment.
+        :param end_x: X of the end of the segment.
+        :param end_y: Y of the end of the segment.
+        """
+        world = self.world
+        tile_size = world.tile_size
+        get_tile, wall = world.get_tile, Tiles.WALL
+        x, y = math.floor(start_x / tile_size), math.floor(start_y / tile_size)
+        end_tile_x, end_tile_y = math.floor(end_x / tile_size), math.floor(end_y / tile_size)
+        dx, dy = end_x - start_x, end_y - start_y
+        step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        # distance along the segment, as a fraction of it, between two vertical or horizontal tile edges
+        delta_x = abs(tile_size / dx) if dx else math.inf
+        delta_y = abs(tile_size / dy) if dy else math.inf
+        next_x = ((x + (step_x > 0)) * tile_size - start_x) / dx if dx else math.inf
+        next_y = ((y + (step_y > 0)) * tile_size - start_y) / dy if dy else math.inf
+        while True:
+            if get_tile(x, y) == wall:
+                return x, y
+            if (x, y) == (end_tile_x, end_tile_y):
+                return None
+            if next_x < next_y:
+                if next_x > 1:
+                    return None
+                x += step_x
+                next_x += delta_x
+            else:
+                if next_y > 1:
+                    return None
+                y += step_y
+                next_y += delta_y
+
+    def line_of_sight(self, start_x: float, start_y: float, end_x: float, end_y: float) -> bool:
+        return self.raycast(start_x, start_y, end_x, end_y) is None
@@ -0,0 +1,35 @@
+from src.utils.constants import GameConfig
+
+__all__: tuple[str, ...] = ("FixedTimestep",)
+
+
+class FixedTimestep:
+    """
+    Accumulates frame time and converts it into a whole number of fixed simulation ticks.
+    :param tick_rate: Simulation ticks per second.
+    :param max_steps: Most ticks run for a single frame, the backlog beyond it is dropped.
+    """
+
+    def __init__(self, tick_rate: int = GameConfig.TICK_RATE, max_steps: int = GameConfig.MAX_CATCH_UP_STEPS) -> None:
+        self.step = 1 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator: float = 0
+
+    @property
+    def alpha(self) -> float:
+        """How far the current frame is between the last tick and the next one, in ``[0, 1)``."""
+        return self.accumulator / self.step
+
+    def advance(self, delta_time: float) -> int:
+        """
+        Adds a frame's duration and returns how many ticks to simulate for it.
+        :param delta_time: Seconds since the previous frame.
+        """
+        self.accumulator += delta_time
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # too far behind to catch up, slow the game down instead of spiralling
+            self.accumulator = self.accumulator % self.step
+            return self.max_steps
+        self.accumulator -= steps * self.step
+        return steps
@@ -0,0 +1,279 @@
+import collections
+import concurrent.futures
+import multiprocessing
+import threading
+import typing as t
+
+import attrs
+import numpy as np
+import numpy.typing as npt
+
+from src.utils.constants import GameConfig
+from src.world.chunks import ChunkedMap, ChunkKey, GridLayout
+from src.world.generation import load_or_generate
+from src.world.navigation import NavigationGrid, Path, PathRequest, PathService
+from src.world.simulation import Simulation
+
+__all__: tuple[str, ...] = (
+    "PathJob",
+    "WorkerJob",
+    "WorkerPool",
+    "WorldSnapshot",
+)
+
+Result = t.TypeVar("Result")
+FloatArray = npt.NDArray[np.float32]
+
+ChunkTiles = tuple[ChunkKey, int, bytes]
+
+# map and navigation grid of a worker, kept in step with the snapshots it gets
+_local = threading.local()
+
+
+def _frozen(array: npt.NDArray[t.Any]) -> npt.NDArray[t.Any]:
+    array.flags.writeable = False
+    return array
+
+
+@attrs.define(frozen=True, slots=True)
+class WorldSnapshot:
+    """
+    Read-only copy of a simulation at a tick boundary, the only state worker jobs may read.
+    Seeded maps only carry their edited chunks, workers regenerate the rest from the seed, so a snapshot stays
+    a few kilobytes when it is pickled for a worker process.
+    :param tic: Tick the snapshot was taken after.
+    :param map_id: Identifies the map the snapshot was taken from, among the maps of the same pool.
+    :param map_version: Version of the map when the chunks were copied.
+    :param seed: Seed of the map, if any.
+    :param width: Width of the map in tiles.
+    :param height: Height of the map in tiles.
+    :param chunk_size: Width and height of a chunk in tiles.
+    :param tile_size: Width and height of a tile in pixels.
+    :param chunks: ``(key, version, tiles)`` of the chunks differing from the generated map, every chunk if unseeded.
+    :param positions: Entity centers in pixels.
+    :param velocities: Entity velocities in pixels per tick.
+    """
+
+    tic: int
+    map_id: int
+    map_version: int
+    seed: t.Optional[int]
+    width: int
+    height: int
+    chunk_size: int
+    tile_size: int
+    chunks: tuple[ChunkTiles, ...]
+    positions: FloatArray
+    velocities: FloatArray
+
+    def world(self) -> ChunkedMap:
+        """Returns a map with the tiles of the snapshot, editing it doesn't touch the simulation."""
+        layout: t.Optional[GridLayout] = None
+        if self.seed is not None:
+            grid = load_or_generate(self.seed, self.width, self.height)
+            layout = GridLayout(grid.data if grid.flags.c_contiguous else grid.tobytes(), self.width)
+        world = ChunkedMap(self.width, self.height, layout, self.chunk_size, self.tile_size, self.seed)
+        for (x, y), _, tiles in self.chunks:
+            world.chunk(x, y).tiles[:] = tiles
+        return world
+
+    def navigation(self) -> NavigationGrid:
+        """Returns a navigation grid over the snapshot, kept by the calling worker and only updated where it differs."""
+        cached: t.Optional[_WorkerMap] = getattr(_local, "map", None)
+        if cached is None or cached.map_id != self.map_id:
+            cached = _local.map = _WorkerMap(self)
+        cached.sync(self)
+        return cached.grid
+
+
+class _WorkerMap:
+    """Map of a worker, edited to match each snapshot so its navigation grid only rebuilds the changed chunks."""
+
+    __slots__ = ("map_id", "world", "grid", "_applied")
+
+    def __init__(self, snapshot: WorldSnapshot) -> None:
+        self.map_id = snapshot.map_id
+        self.world = snapshot.world()
+        self.grid = NavigationGrid(self.world)
+        self._applied = {key: version for key, version, _ in snapshot.chunks}
+
+    def sync(self, snapshot: WorldSnapshot) -> None:
+        world, applied = self.world, self._applied
+        chunks = {key: (version, tiles) for key, version, tiles in snapshot.chunks}
+        # jobs may run out of order, so chunks edited after an older snapshot are reset to the generated tiles
+        for key in [key for key in applied if key not in chunks]:
+            del applied[key]
+            world.rebuild(*key)
+        for key, (version, tiles) in chunks.items():
+            if applied.get(key) == version:
+                continue
+            applied[key] = version
+            chunk = world.chunk(*key)
+            chunk.tiles[:] = tiles
+            chunk.version += 1
+            world.version += 1
+
+
+class WorkerJob(t.Protocol[Result]):
+    """Work split between a worker, which only sees a snapshot, and the main thread, which applies its result."""
+
+    def compute(self, snapshot: WorldSnapshot) -> Result:
+        ...
+
+    def apply(self, simulation: Simulation, result: Result) -> None:
+        ...
+
+
+class _Snapshots:
+    """Builds snapshots, copying only the chunks edited since the previous one."""
+
+    def __init__(self) -> None:
+        self._world: t.Optional[ChunkedMap] = None
+        self._map_id = 0
+        self._map_version = -1
+        self._copies: dict[ChunkKey, ChunkTiles] = {}
+        self._chunks: tuple[ChunkTiles, ...] = ()
+
+    def _copy_chunks(self, world: ChunkedMap) -> tuple[ChunkTiles, ...]:
+        if world is not self._world:
+            self._world, self._map_id, self._map_version = world, self._map_id + 1, -1
+            self._copies.clear()
+            # workers can't rebuild an unseeded layout, so every chunk of it is sent
+            if world.seed is None:
+                for chunk_x in range(world.chunks_x):
+                    for chunk_y in range(world.chunks_y):
+                        world.chunk(chunk_x, chunk_y)
+        if self._map_version == world.version:
+            return self._chunks
+        copies = self._copies
+        for chunk in world.iter_chunks():
+            if world.seed is not None and not chunk.version:
+                continue
+            copy = copies.get(chunk.key)
+            if copy is None or copy[1] != chunk.version:
+                copies[chunk.key] = chunk.key, chunk.version, bytes(chunk.tiles)
+        self._chunks = tuple(copies.values())
+        self._map_version = world.version
+        return self._chunks
+
+    def take(self, simulation: Simulation) -> WorldSnapshot:
+        world, entities = simulation.world, simulation.entities
+        count = entities.count
+        chunks = self._copy_chunks(world)
+        return WorldSnapshot(
+            simulation.tic,
+            self._map_id,
+            world.version,
+            world.seed,
+            world.width,
+            world.height,
+            world.chunk_size,
+            world.tile_size,
+            chunks,
+            _frozen(entities.position[:count].copy()),
+            _frozen(entities.velocity[:count].copy()),
+        )
+
+
+class WorkerPool:
+    """
+    Runs :class:`WorkerJob` computations off the main thread against a double-buffered world snapshot.
+    :meth:`publish` builds the next snapshot aside and swaps it in at a tick boundary, jobs submitted afterwards
+    read it while the simulation keeps advancing. Results are applied in submission order by :meth:`apply`,
+    which the game calls at the start of a tick so the simulation never changes mid-tick.
+    Jobs are pure Python, so only processes run them in parallel, threads share the interpreter lock with
+    the game and merely interleave with it.
+    :param workers: Number of worker threads or processes.
+    :param processes: Whether to use processes, jobs and snapshots are then pickled for every submission.
+    """
+
+    def __init__(self, workers: int = GameConfig.SIMULATION_WORKERS, processes: bool = False) -> None:
+        self.executor: concurrent.futures.Executor
+        if processes:
+            # forking would copy the window and its driver threads into every worker
+            context = multiprocessing.get_context("spawn")
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        else:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulation")
+        self.snapshot: t.Optional[WorldSnapshot] = None
+        self._snapshots = _Snapshots()
+        self._jobs: collections.deque[tuple[WorkerJob[t.Any], concurrent.futures.Future[t.Any]]] = collections.deque()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def publish(self, simulation: Simulation) -> WorldSnapshot:
+        """Swaps in a snapshot of the simulation as it is now, jobs still running keep the previous one."""
+        self.snapshot = self._snapshots.take(simulation)
+        return self.snapshot
+
+    def submit(self, job: WorkerJob[Result]) -> concurrent.futures.Future[Result]:
+        """Starts a job on the last published snapshot."""
+        if self.snapshot is None:
+            raise RuntimeError("no snapshot was published yet")
+        future = self.executor.submit(job.compute, self.snapshot)
+        self._jobs.append((job, future))
+        return future
+
+    def apply(self, simulation: Simulation, wait: bool = False) -> int:
+        """
+        Applies the results of the finished jobs, stopping at the first one still running so the order holds.
+        Returns how many jobs were applied, exceptions raised by a job are raised again here.
+        :param simulation: Simulation to apply the results to.
+        :param wait: Whether to block until every submitted job finished.
+        """
+        applied = 0
+        jobs = self._jobs
+        while jobs and (wait or jobs[0][1].done()):
+            job, future = jobs.popleft()
+            job.apply(simulation, future.result())
+            applied += 1
+        return applied
+
+    def close(self) -> None:
+        """Stops the workers, results of the jobs still running are dropped."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._jobs.clear()
+
+
+class PathJob:
+    """
+    Searches a batch of path requests on a worker.
+    Paths searched on a map that was edited since are kept if they are still walkable, the others are queued
+    again, and searched on the main thread once they were thrown away ``retries`` times so edits can't starve them.
+    :param requests: Requests taken from a :class:`PathService`.
+    :param retries: Times a request is sent back to the workers before the main thread searches it.
+    """
+
+    __slots__ = ("requests", "retries")
+
+    def __init__(self, requests: t.Sequence[PathRequest], retries: int = GameConfig.PATH_JOB_RETRIES) -> None:
+        self.requests = tuple(requests)
+        self.retries = retries
+
+    @classmethod
+    def take(cls, service: PathService, count: int = GameConfig.PATH_JOB_SIZE) -> t.Optional["PathJob"]:
+        """Takes the next requests of a service, or returns ``None`` if none are queued."""
+        requests = service.take(count)
+        return cls(requests) if requests else None
+
+    def compute(self, snapshot: WorldSnapshot) -> tuple[int, tuple[t.Optional[Path], ...]]:
+        grid = snapshot.navigation()
+        return snapshot.map_version, tuple(grid.find_path(request.start, request.goal) for request in self.requests)
+
+    def apply(self, simulation: Simulation, result: tuple[int, tuple[t.Optional[Path], ...]]) -> None:
+        map_version, paths = result
+        service = simulation.paths
+        stale = map_version != simulation.world.version
+        is_walkable = service.grid.is_walkable
+        retry: list[PathRequest] = []
+        for request, path in zip(self.requests, paths):
+            # an unreachable goal may have been opened by the edit, so only found paths can be checked
+            if not stale or (path is not None and all(is_walkable(x, y) for x, y in path)):
+                service.complete(request, path)
+            elif request.attempts >= self.retries:
+                service.complete(request, service.find(request.start, request.goal))
+            else:
+                request.attempts += 1
+                retry.append(request)
+        service.pending.extendleft(reversed(retry))
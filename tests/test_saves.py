@@ -0,0 +1,36 @@
+import pathlib
+
+from src.world import ChunkedMap, SaveWriter, Simulation, load_latest
+
+
+def _simulation(camera_x: float) -> Simulation:
+    simulation = Simulation(ChunkedMap(32, 32))
+    simulation.camera.x = camera_x
+    return simulation
+
+
+def _save(directory: pathlib.Path, *camera_xs: float) -> SaveWriter:
+    writer = SaveWriter(directory)
+    for camera_x in camera_xs:
+        writer.save(_simulation(camera_x))
+    writer.flush()
+    return writer
+
+
+def test_new_session_continues_numbering(tmp_path: pathlib.Path) -> None:
+    _save(tmp_path, 690, 700, 710, 720, 730)
+    writer = _save(tmp_path, 999)
+    assert writer.sequence == 6
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["00000006.full"]
+    simulation = _simulation(0)
+    assert load_latest(tmp_path, simulation) == 6
+    assert simulation.camera.x == 999
+
+
+def test_stale_deltas_are_not_applied(tmp_path: pathlib.Path) -> None:
+    _save(tmp_path, 690, 700, 710)
+    writer = _save(tmp_path, 999, 1000)
+    assert writer.sequence == 5
+    simulation = _simulation(0)
+    assert load_latest(tmp_path, simulation) == 5
+    assert simulation.camera.x == 1000